@@ -1,22 +1,52 @@
 """Middleware for security and rate limiting."""
 
 import asyncio
-from typing import Callable
-from fastapi import Request, Response, HTTPException
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+import functools
+import time
+from typing import Dict, Optional, Tuple
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope, Send
 
 from motive_proxy.rate_limiter import RateLimiter, RateLimitConfig
 from motive_proxy.settings import get_settings
 from motive_proxy.observability import get_logger, get_metrics_collector
 from motive_proxy.models import ErrorResponse, ErrorDetails
 
+# Health, metrics and API docs skip every security check
+_BYPASS = frozenset({"/health", "/health/detailed", "/metrics", "/docs", "/redoc", "/openapi.json"})
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    """Middleware for security features: rate limiting, payload size, auth."""
+# Cached 429s above this count get their expired entries swept
+_REJECT_CACHE_SWEEP_SIZE = 4096
+
+
+def _render_error(status_code: int, message: str, detail: str) -> bytes:
+    """Serialize a security error body."""
+    return ErrorResponse(
+        error=ErrorDetails(
+            message=message,
+            type="security_error",
+            code=str(status_code),
+            param=detail
+        )
+    ).model_dump_json().encode()
+
+
+# 401/413/429 bodies come from a small fixed set of messages, so each is
+# rendered once and then served as bytes
+_cached_error_body = functools.lru_cache(maxsize=32)(_render_error)
+
+
+class SecurityMiddleware:
+    """Middleware for security features: rate limiting, payload size, auth.
+    
+    A plain ASGI callable rather than a ``BaseHTTPMiddleware``: requests that
+    pass the checks are forwarded with the original ``receive``/``send``, so no
+    task group or body wrapping sits on the happy path.
+    """
     
     def __init__(self, app):
-        super().__init__(app)
+        self.app = app
         self.settings = get_settings()
         self.logger = get_logger("motive_proxy.security_middleware")
         self.metrics = get_metrics_collector()
@@ -31,84 +61,133 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             self.rate_limiter = RateLimiter(rate_config)
         else:
             self.rate_limiter = None
+        
+        # Client IP -> (monotonic expiry, rendered 429 body) for identifiers the
+        # limiter has just rejected; repeats are answered without re-checking
+        self._reject_cache: Dict[str, Tuple[float, bytes]] = {}
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through security middleware."""
-        client_ip = self._get_client_ip(request)
+        if scope["type"] != "http" or scope["path"] in _BYPASS:
+            await self.app(scope, receive, send)
+            return
         
-        # Skip security checks for health and metrics endpoints
-        if request.url.path in ["/health", "/metrics"]:
-            return await call_next(request)
+        headers = Headers(scope=scope)
+        client_ip = self._get_client_ip(headers, scope)
+        response_started = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
         
         try:
-            # Rate limiting
-            if self.rate_limiter:
-                is_allowed, reason = await self.rate_limiter.is_allowed(client_ip)
-                if not is_allowed:
-                    self.metrics.increment_counter("rate_limit_exceeded", tags={"ip": client_ip})
-                    return self._create_error_response(429, "Rate limit exceeded", reason)
-            
-            # Payload size check
-            content_length = request.headers.get("content-length")
-            if content_length and int(content_length) > self.settings.max_payload_size:
-                self.metrics.increment_counter("payload_too_large", tags={"ip": client_ip})
-                return self._create_error_response(413, "Payload too large", 
-                                                 f"Request size exceeds {self.settings.max_payload_size} bytes")
-            
-            # API key authentication (if enabled)
-            if self.settings.enable_api_key_auth:
-                api_key = request.headers.get(self.settings.api_key_header.lower())
-                if not api_key or api_key not in self.settings.valid_api_keys:
-                    self.metrics.increment_counter("unauthorized_request", tags={"ip": client_ip})
-                    return self._create_error_response(401, "Unauthorized", "Invalid or missing API key")
+            rejection = await self._check_request(headers, client_ip)
+            if rejection is not None:
+                await rejection(scope, receive, send)
+                return
             
             # Process request
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
             
             # Record successful request metrics
             self.metrics.increment_counter("requests_processed", tags={"ip": client_ip})
             
-            return response
-            
         except Exception as exc:
             self.logger.error("Security middleware error", 
                             error=str(exc),
                             client_ip=client_ip,
                             exc_info=True)
             self.metrics.increment_counter("middleware_error", tags={"ip": client_ip})
-            return self._create_error_response(500, "Internal server error", str(exc))
+            if response_started:
+                # Too late for an error response; let the server close the connection
+                raise
+            response = self._create_error_response(500, "Internal server error", str(exc), cache=False)
+            await response(scope, receive, send)
     
-    def _get_client_ip(self, request: Request) -> str:
+    async def _check_request(self, headers: Headers, client_ip: str) -> Optional[Response]:
+        """Run the security checks; return the rejection response, or None to proceed."""
+        # Payload size check, from the declared Content-Length alone: runs
+        # first so an oversized body is never read or rate-limit checked
+        content_length = headers.get("content-length")
+        if content_length and int(content_length) > self.settings.max_payload_size:
+            self.metrics.increment_counter("payload_too_large", tags={"ip": client_ip})
+            return self._create_error_response(413, "Payload too large", 
+                                             f"Request size exceeds {self.settings.max_payload_size} bytes")
+        
+        # Rate limiting
+        if self.rate_limiter:
+            cached = self._reject_cache.get(client_ip)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self.metrics.increment_counter("rate_limit_exceeded", tags={"ip": client_ip})
+                    return Response(content=cached[1], status_code=429, media_type="application/json")
+                del self._reject_cache[client_ip]
+            
+            is_allowed, reason = await self.rate_limiter.is_allowed(client_ip)
+            if not is_allowed:
+                self.metrics.increment_counter("rate_limit_exceeded", tags={"ip": client_ip})
+                body = _cached_error_body(429, "Rate limit exceeded", reason)
+                await self._cache_rejection(client_ip, body)
+                return Response(content=body, status_code=429, media_type="application/json")
+        
+        # API key authentication (if enabled)
+        if self.settings.enable_api_key_auth:
+            api_key = headers.get(self.settings.api_key_header.lower())
+            if not api_key or api_key not in self.settings.valid_api_keys:
+                self.metrics.increment_counter("unauthorized_request", tags={"ip": client_ip})
+                return self._create_error_response(401, "Unauthorized", "Invalid or missing API key")
+        
+        return None
+    
+    async def _cache_rejection(self, client_ip: str, body: bytes) -> None:
+        """Remember a 429 body for ``client_ip`` until the limiter would admit it again."""
+        retry_after = await self.rate_limiter.retry_after(client_ip)
+        if retry_after <= 0:
+            return
+        now = time.monotonic()
+        if len(self._reject_cache) >= _REJECT_CACHE_SWEEP_SIZE:
+            self._reject_cache = {
+                ip: cached for ip, cached in self._reject_cache.items() if cached[0] > now
+            }
+        self._reject_cache[client_ip] = (now + retry_after, body)
+    
+    def reset(self) -> None:
+        """Drop rate limit history and cached rejections."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.reset()
+        self._reject_cache.clear()
+    
+    def _get_client_ip(self, headers: Headers, scope) -> str:
         """Extract client IP address."""
         # Check for forwarded headers first (for reverse proxies)
-        forwarded_for = request.headers.get("x-forwarded-for")
+        forwarded_for = headers.get("x-forwarded-for")
         if forwarded_for:
             return forwarded_for.split(",")[0].strip()
         
-        real_ip = request.headers.get("x-real-ip")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip
         
         # Fallback to direct connection
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         
         return "unknown"
     
-    def _create_error_response(self, status_code: int, message: str, detail: str) -> JSONResponse:
-        """Create standardized error response."""
-        error_response = ErrorResponse(
-            error=ErrorDetails(
-                message=message,
-                type="security_error",
-                code=str(status_code),
-                param=detail
-            )
-        )
+    def _create_error_response(self, status_code: int, message: str, detail: str,
+                               cache: bool = True) -> Response:
+        """Create standardized error response.
         
-        return JSONResponse(
+        Pass ``cache=False`` when ``detail`` is unbounded (e.g. exception text).
+        """
+        render = _cached_error_body if cache else _render_error
+        return Response(
+            content=render(status_code, message, detail),
             status_code=status_code,
-            content=error_response.model_dump()
+            media_type="application/json",
         )
 
 
@@ -1,11 +1,13 @@
 """Observability utilities for logging and metrics."""
 
 import logging
+import math
 import os
 import time
 import uuid
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, DefaultDict, Dict, Optional
 
 import structlog
 from fastapi import Request
@@ -73,46 +75,85 @@ def generate_correlation_id() -> str:
 class MetricsCollector:
     """Simple metrics collector for counters and timers."""
     
+    # Bound on cached tag keys so pathological tag cardinality cannot grow it forever
+    _KEY_CACHE_MAX = 10_000
+    
     def __init__(self):
-        self._counters: Dict[str, int] = {}
-        self._timers: Dict[str, list] = {}
+        self._counters: DefaultDict[str, int] = defaultdict(int)
+        # Running aggregates per key (count/min/max/sum) rather than every observation
+        self._timers: Dict[str, Dict[str, float]] = {}
         self._lock = None  # Would use threading.Lock in production
+        self._key_cache: Dict[tuple, str] = {}
+        # Cached snapshot(), rebuilt only after a counter or timer changes
+        self._dirty = True
+        self._snapshot: Optional[Dict[str, Dict[str, Any]]] = None
     
     def increment_counter(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None) -> None:
         """Increment a counter metric."""
         key = self._make_key(name, tags)
-        self._counters[key] = self._counters.get(key, 0) + value
+        self._counters[key] += value
+        self._dirty = True
     
     def record_timer(self, name: str, duration_seconds: float, tags: Optional[Dict[str, str]] = None) -> None:
         """Record a timer metric."""
         key = self._make_key(name, tags)
-        if key not in self._timers:
-            self._timers[key] = []
-        self._timers[key].append(duration_seconds)
+        stats = self._timers.get(key)
+        if stats is None:
+            stats = self._timers[key] = {"count": 0, "min": math.inf, "max": -math.inf, "sum": 0.0}
+        stats["count"] += 1
+        if duration_seconds < stats["min"]:
+            stats["min"] = duration_seconds
+        if duration_seconds > stats["max"]:
+            stats["max"] = duration_seconds
+        stats["sum"] += duration_seconds
+        self._dirty = True
     
     def get_counters(self) -> Dict[str, int]:
         """Get all counter values."""
-        return self._counters.copy()
+        return dict(self._counters)
     
     def get_timers(self) -> Dict[str, Dict[str, float]]:
         """Get timer statistics (count, min, max, avg)."""
-        result = {}
-        for key, values in self._timers.items():
-            if values:
-                result[key] = {
-                    "count": len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values),
-                }
-        return result
+        return {
+            key: {
+                "count": stats["count"],
+                "min": stats["min"],
+                "max": stats["max"],
+                "avg": stats["sum"] / stats["count"],
+            }
+            for key, stats in self._timers.items()
+        }
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters and timers together, reusing the last result if nothing changed.
+        
+        The returned dict is shared between callers and must not be mutated.
+        """
+        if self._dirty or self._snapshot is None:
+            self._snapshot = {"counters": self.get_counters(), "timers": self.get_timers()}
+            self._dirty = False
+        return self._snapshot
+    
+    def reset(self) -> None:
+        """Drop all counters and timers (e.g. between tests sharing the collector)."""
+        self._counters.clear()
+        self._timers.clear()
+        self._dirty = True
     
     def _make_key(self, name: str, tags: Optional[Dict[str, str]]) -> str:
         """Create a key for metrics with optional tags."""
         if not tags:
             return name
-        tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
-        return f"{name}[{tag_str}]"
+        cache_key = (name, frozenset(tags.items()))
+        key = self._key_cache.get(cache_key)
+        if key is None:
+            tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
+            key = f"{name}[{tag_str}]"
+            if len(self._key_cache) >= self._KEY_CACHE_MAX:
+                # Evict the oldest entry (dicts preserve insertion order)
+                del self._key_cache[next(iter(self._key_cache))]
+            self._key_cache[cache_key] = key
+        return key
 
 
 # Global metrics collector instance
@@ -125,21 +166,24 @@ def get_metrics_collector() -> MetricsCollector:
 
 
 class TimerContext:
-    """Context manager for timing operations."""
+    """Context manager for timing operations on the monotonic clock."""
+    
+    __slots__ = ("name", "tags", "start_time", "_collector")
     
     def __init__(self, name: str, tags: Optional[Dict[str, str]] = None):
         self.name = name
         self.tags = tags
-        self.start_time: Optional[float] = None
+        self.start_time: Optional[int] = None  # perf_counter_ns() at __enter__
+        self._collector = _metrics  # module global, no getter call per timer
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.start_time is not None:
-            duration = time.time() - self.start_time
-            get_metrics_collector().record_timer(self.name, duration, self.tags)
+            duration = (time.perf_counter_ns() - self.start_time) / 1e9
+            self._collector.record_timer(self.name, duration, self.tags)
 
 
 def time_operation(name: str, tags: Optional[Dict[str, str]] = None) -> TimerContext:
@@ -13,6 +13,9 @@ class ProtocolManager:
     def __init__(self):
         self.logger = get_logger("motive_proxy.protocol_manager")
         self._adapters: Dict[ProtocolType, ProtocolAdapter] = {}
+        # Lookup caches kept in step with _adapters by register_adapter()
+        self._by_endpoint: Dict[str, ProtocolAdapter] = {}
+        self._fallback: Optional[ProtocolAdapter] = None
         self._register_default_adapters()
     
     def _register_default_adapters(self):
@@ -24,7 +27,15 @@ class ProtocolManager:
     
     def register_adapter(self, adapter: ProtocolAdapter):
         """Register a new protocol adapter."""
-        self._adapters[adapter.get_protocol_type()] = adapter
+        protocol_type = adapter.get_protocol_type()
+        previous = self._adapters.get(protocol_type)
+        if previous is not None and self._by_endpoint.get(previous.get_endpoint_path()) is previous:
+            del self._by_endpoint[previous.get_endpoint_path()]
+        self._adapters[protocol_type] = adapter
+        self._by_endpoint[adapter.get_endpoint_path()] = adapter
+        if protocol_type == ProtocolType.OPENAI:
+            # Fallback to OpenAI for unknown endpoints (backward compatibility)
+            self._fallback = adapter
         self.logger.info("Registered protocol adapter", 
                         protocol_type=adapter.get_protocol_type().value)
     
@@ -34,10 +45,7 @@ class ProtocolManager:
     
     def get_adapter_by_endpoint(self, endpoint_path: str) -> Optional[ProtocolAdapter]:
         """Get adapter by endpoint path."""
-        for adapter in self._adapters.values():
-            if adapter.get_endpoint_path() == endpoint_path:
-                return adapter
-        return None
+        return self._by_endpoint.get(endpoint_path)
     
     def list_supported_protocols(self) -> list[str]:
         """List all supported protocol types."""
@@ -45,10 +53,7 @@ class ProtocolManager:
     
     def get_adapter_for_request(self, raw_request: Dict, endpoint_path: str) -> Optional[ProtocolAdapter]:
         """Determine the best adapter for a request."""
-        # First try to match by endpoint
-        adapter = self.get_adapter_by_endpoint(endpoint_path)
-        if adapter:
-            return adapter
-        
-        # Fallback to OpenAI for unknown endpoints (backward compatibility)
-        return self.get_adapter(ProtocolType.OPENAI)
+        if not endpoint_path:
+            return self._fallback
+        # Match by endpoint, falling back to OpenAI for unknown endpoints
+        return self._by_endpoint.get(endpoint_path, self._fallback)
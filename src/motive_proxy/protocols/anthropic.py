@@ -3,6 +3,25 @@
 from typing import Dict, Any, List
 from .base import ProtocolAdapter, ProtocolRequest, ProtocolResponse, ProtocolType
 
+# Anthropic only supports user and assistant roles
+_ANTHROPIC_ROLES = frozenset(("user", "assistant"))
+
+# Optional fields carried through in ProtocolRequest.extra_params
+_EXTRA_FIELDS = ("top_p", "stop_sequences", "system")
+
+# Response envelope with the static fields filled in; format_response copies it
+# and sets the per-response fields (key order matches the Anthropic API)
+_RESPONSE_TEMPLATE: Dict[str, Any] = {
+    "id": None,
+    "type": "message",
+    "role": "assistant",
+    "content": None,
+    "model": None,
+    "stop_reason": None,
+    "stop_sequence": None,
+    "usage": None,
+}
+
 
 class AnthropicAdapter(ProtocolAdapter):
     """Adapter for Anthropic Claude API."""
@@ -12,49 +31,39 @@ class AnthropicAdapter(ProtocolAdapter):
     
     def parse_request(self, raw_request: Dict[str, Any]) -> ProtocolRequest:
         """Parse Anthropic request format."""
-        # Anthropic uses different field names
-        messages = raw_request.get("messages", [])
+        get = raw_request.get
         
         # Convert Anthropic format to standard format
-        standard_messages = []
-        for msg in messages:
-            standard_messages.append({
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", "")
-            })
+        standard_messages = [
+            {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+            for msg in get("messages", [])
+        ]
         
         return ProtocolRequest(
-            session_id=raw_request.get("model", ""),
+            session_id=get("model", ""),
             messages=standard_messages,
-            stream=raw_request.get("stream", False),
-            model=raw_request.get("model"),
-            temperature=raw_request.get("temperature"),
-            max_tokens=raw_request.get("max_tokens"),
-            extra_params={
-                "top_p": raw_request.get("top_p"),
-                "stop_sequences": raw_request.get("stop_sequences"),
-                "system": raw_request.get("system"),
-            }
+            stream=get("stream", False),
+            model=get("model"),
+            temperature=get("temperature"),
+            max_tokens=get("max_tokens"),
+            extra_params={field: get(field) for field in _EXTRA_FIELDS},
         )
     
     def format_response(self, response: ProtocolResponse) -> Dict[str, Any]:
         """Format response in Anthropic format."""
-        return {
-            "id": f"msg-{response.session_id[:8]}",
-            "type": "message",
-            "role": "assistant",
-            "content": [{
-                "type": "text",
-                "text": response.content
-            }],
-            "model": response.model,
-            "stop_reason": response.finish_reason or "end_turn",
-            "stop_sequence": None,
-            "usage": response.usage or {
-                "input_tokens": 0,
-                "output_tokens": len(response.content.split()),
-            }
+        out = dict(_RESPONSE_TEMPLATE)
+        out["id"] = f"msg-{response.session_id[:8]}"
+        out["content"] = [{
+            "type": "text",
+            "text": response.content
+        }]
+        out["model"] = response.model
+        out["stop_reason"] = response.finish_reason or "end_turn"
+        out["usage"] = response.usage or {
+            "input_tokens": 0,
+            "output_tokens": len(response.content.split()),
         }
+        return out
     
     def get_endpoint_path(self) -> str:
         """Get Anthropic endpoint path."""
@@ -62,21 +71,16 @@ class AnthropicAdapter(ProtocolAdapter):
     
     def validate_request(self, request: ProtocolRequest) -> bool:
         """Validate Anthropic request."""
-        if not request.session_id:
-            return False
-        if not request.messages:
+        if not request.session_id or not request.messages:
             return False
         if not isinstance(request.messages, list):
             return False
         
         # Anthropic has stricter validation
-        for message in request.messages:
-            if not isinstance(message, dict):
-                return False
-            if "role" not in message or "content" not in message:
-                return False
-            # Anthropic only supports user and assistant roles
-            if message["role"] not in ["user", "assistant"]:
-                return False
-        
-        return True
+        return all(
+            isinstance(message, dict)
+            and "content" in message
+            and isinstance(role := message.get("role"), str)
+            and role in _ANTHROPIC_ROLES
+            for message in request.messages
+        )
@@ -1,18 +1,23 @@
 """Base protocol adapter interface."""
 
+import sys
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
+# dataclass(slots=True) needs Python 3.10; older interpreters get a regular class
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class ProtocolType(Enum):
     """Supported protocol types."""
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProtocolRequest:
     """Base protocol request structure."""
     session_id: str
@@ -21,14 +26,10 @@ class ProtocolRequest:
     model: Optional[str] = None
     temperature: Optional[float] = None
     max_tokens: Optional[int] = None
-    extra_params: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.extra_params is None:
-            self.extra_params = {}
+    extra_params: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProtocolResponse:
     """Base protocol response structure."""
     content: str
@@ -36,11 +37,7 @@ class ProtocolResponse:
     session_id: str
     usage: Optional[Dict[str, int]] = None
     finish_reason: Optional[str] = None
-    extra_data: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.extra_data is None:
-            self.extra_data = {}
+    extra_data: Dict[str, Any] = field(default_factory=dict)
 
 
 class ProtocolAdapter(ABC):
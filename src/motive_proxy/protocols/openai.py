@@ -1,8 +1,25 @@
 """OpenAI protocol adapter."""
 
+import time
 from typing import Dict, Any, List
 from .base import ProtocolAdapter, ProtocolRequest, ProtocolResponse, ProtocolType
 
+_OPENAI_ROLES = frozenset(("user", "assistant", "system"))
+
+# Optional sampling fields carried through in ProtocolRequest.extra_params
+_EXTRA_FIELDS = ("top_p", "frequency_penalty", "presence_penalty", "stop")
+
+# Response envelope with the static fields filled in; format_response copies it
+# and sets the per-response fields (key order matches the OpenAI API)
+_RESPONSE_TEMPLATE: Dict[str, Any] = {
+    "id": None,
+    "object": "chat.completion",
+    "created": 0,
+    "model": None,
+    "choices": None,
+    "usage": None,
+}
+
 
 class OpenAIAdapter(ProtocolAdapter):
     """Adapter for OpenAI Chat Completions API."""
@@ -12,42 +29,41 @@ class OpenAIAdapter(ProtocolAdapter):
     
     def parse_request(self, raw_request: Dict[str, Any]) -> ProtocolRequest:
         """Parse OpenAI request format."""
+        get = raw_request.get
         return ProtocolRequest(
-            session_id=raw_request.get("model", ""),
-            messages=raw_request.get("messages", []),
-            stream=raw_request.get("stream", False),
-            model=raw_request.get("model"),
-            temperature=raw_request.get("temperature"),
-            max_tokens=raw_request.get("max_tokens"),
-            extra_params={
-                "top_p": raw_request.get("top_p"),
-                "frequency_penalty": raw_request.get("frequency_penalty"),
-                "presence_penalty": raw_request.get("presence_penalty"),
-                "stop": raw_request.get("stop"),
-            }
+            session_id=get("model", ""),
+            messages=get("messages", []),
+            stream=get("stream", False),
+            model=get("model"),
+            temperature=get("temperature"),
+            max_tokens=get("max_tokens"),
+            extra_params={field: get(field) for field in _EXTRA_FIELDS},
         )
     
     def format_response(self, response: ProtocolResponse) -> Dict[str, Any]:
         """Format response in OpenAI format."""
-        return {
-            "id": f"chatcmpl-{response.session_id[:8]}",
-            "object": "chat.completion",
-            "created": int(__import__("time").time()),
-            "model": response.model,
-            "choices": [{
-                "index": 0,
-                "message": {
-                    "role": "assistant",
-                    "content": response.content
-                },
-                "finish_reason": response.finish_reason or "stop"
-            }],
-            "usage": response.usage or {
+        out = dict(_RESPONSE_TEMPLATE)
+        out["id"] = f"chatcmpl-{response.session_id[:8]}"
+        out["created"] = int(time.time())
+        out["model"] = response.model
+        out["choices"] = [{
+            "index": 0,
+            "message": {
+                "role": "assistant",
+                "content": response.content
+            },
+            "finish_reason": response.finish_reason or "stop"
+        }]
+        usage = response.usage
+        if not usage:
+            completion_tokens = len(response.content.split())
+            usage = {
                 "prompt_tokens": 0,
-                "completion_tokens": len(response.content.split()),
-                "total_tokens": len(response.content.split())
+                "completion_tokens": completion_tokens,
+                "total_tokens": completion_tokens
             }
-        }
+        out["usage"] = usage
+        return out
     
     def get_endpoint_path(self) -> str:
         """Get OpenAI endpoint path."""
@@ -55,20 +71,16 @@ class OpenAIAdapter(ProtocolAdapter):
     
     def validate_request(self, request: ProtocolRequest) -> bool:
         """Validate OpenAI request."""
-        if not request.session_id:
-            return False
-        if not request.messages:
+        if not request.session_id or not request.messages:
             return False
         if not isinstance(request.messages, list):
             return False
         
         # Validate message format
-        for message in request.messages:
-            if not isinstance(message, dict):
-                return False
-            if "role" not in message or "content" not in message:
-                return False
-            if message["role"] not in ["user", "assistant", "system"]:
-                return False
-        
-        return True
+        return all(
+            isinstance(message, dict)
+            and "content" in message
+            and isinstance(role := message.get("role"), str)
+            and role in _OPENAI_ROLES
+            for message in request.messages
+        )
@@ -1,54 +1,182 @@
 """Rate limiting functionality for MotiveProxy."""
 
 import time
-import asyncio
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
 
 from motive_proxy.observability import get_logger
 
+# All times are integer nanoseconds from time.monotonic_ns()
+_NS_PER_SECOND = 1_000_000_000
+# get_stats reads rings of per-second and per-minute request counts
+_RING_SLOTS = 60
+_BURST_WINDOW_NS = 10 * _NS_PER_SECOND
+_MINUTE_NS = 60 * _NS_PER_SECOND
+_HOUR_NS = 3600 * _NS_PER_SECOND
+# An entry idle this long has a full burst bucket and no requests inside
+# any window, so dropping it loses nothing
+_MAX_WINDOW_NS = _HOUR_NS
 
-@dataclass
+
+@dataclass(frozen=True)
 class RateLimitConfig:
     """Configuration for rate limiting."""
     requests_per_minute: int = 60
     requests_per_hour: int = 1000
     burst_limit: int = 10
     window_size_seconds: int = 60
+    # Tracked identifiers above which stale entries are swept on insert
+    max_ips: int = 65536
+    # Limits pre-scaled to the integer units is_allowed compares against
+    burst_capacity: int = field(init=False, repr=False)
+    minute_limit_ns: int = field(init=False, repr=False)
+    hour_limit_ns: int = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "burst_capacity", self.burst_limit * _BURST_WINDOW_NS)
+        object.__setattr__(self, "minute_limit_ns", self.requests_per_minute * _MINUTE_NS)
+        object.__setattr__(self, "hour_limit_ns", self.requests_per_hour * _HOUR_NS)
+
+
+class SlidingWindowCounter:
+    """Admitted-request count over a sliding window, kept as two integers.
+    
+    Holds the count for the current fixed window and the one before it; the
+    sliding estimate weights the previous count by how much of it still
+    overlaps the window ending now.
+    """
+    
+    __slots__ = ("window_ns", "window_index", "curr", "prev")
+    
+    def __init__(self, window_ns: int, now_ns: int):
+        self.window_ns = window_ns
+        self.window_index = now_ns // window_ns
+        self.curr = 0
+        self.prev = 0
+    
+    def _roll(self, now_ns: int) -> int:
+        """Move to the window containing ``now_ns``; return nanoseconds into it."""
+        index = now_ns // self.window_ns
+        if index != self.window_index:
+            self.prev = self.curr if index == self.window_index + 1 else 0
+            self.curr = 0
+            self.window_index = index
+        return now_ns - index * self.window_ns
+    
+    def is_full(self, now_ns: int, limit_ns: int) -> bool:
+        """Whether one more request would exceed a limit (integer math only).
+        
+        ``limit_ns`` is the request limit multiplied by ``window_ns``.
+        """
+        window = self.window_ns
+        elapsed = self._roll(now_ns)
+        # prev * (1 - elapsed/window) + curr + 1 > limit, scaled by window
+        return self.prev * (window - elapsed) + (self.curr + 1) * window > limit_ns
+    
+    def estimate(self, now_ns: int) -> float:
+        """Roll the window forward to ``now_ns`` and return the sliding count."""
+        elapsed = self._roll(now_ns)
+        return self.prev * (1.0 - elapsed / self.window_ns) + self.curr
+    
+    def retry_after(self, now_ns: int, limit: int) -> float:
+        """Seconds until one more request fits under ``limit``, if none are admitted meanwhile."""
+        elapsed = self._roll(now_ns)
+        window = self.window_ns
+        room = limit - 1 - self.curr
+        if room >= 0:
+            if self.prev <= room:
+                return 0.0
+            # Wait for the previous window's weight to decay to the room left
+            wait_ns = window * (1.0 - room / self.prev) - elapsed
+        else:
+            # Over on this window alone: in the next one its count becomes prev
+            wait_ns = window - elapsed
+            wait_ns += window * (1.0 - max(limit - 1, 0) / self.curr)
+        return wait_ns / _NS_PER_SECOND
 
 
 @dataclass
 class RateLimitEntry:
-    """Rate limit tracking entry."""
-    requests: deque = field(default_factory=deque)
-    last_cleanup: float = field(default_factory=time.time)
-    
-    def add_request(self, timestamp: float):
-        """Add a request timestamp."""
-        self.requests.append(timestamp)
-        self._cleanup_old_requests(timestamp)
-    
-    def _cleanup_old_requests(self, current_time: float):
-        """Remove requests older than the window."""
-        cutoff_time = current_time - 3600  # 1 hour window
-        while self.requests and self.requests[0] < cutoff_time:
-            self.requests.popleft()
-    
-    def get_recent_requests(self, window_seconds: int, current_time: float) -> int:
-        """Get number of requests in the last window_seconds."""
-        cutoff_time = current_time - window_seconds
-        return sum(1 for req_time in self.requests if req_time >= cutoff_time)
+    """Admission state and request counts for one identifier.
+    
+    Bursts go through a token bucket that refills continuously at
+    ``burst_limit / 10s``. It is held as integer credit scaled by the burst
+    window in nanoseconds: a request costs ``_BURST_WINDOW_NS`` and each
+    elapsed nanosecond adds ``burst_limit``. The per-minute and per-hour
+    limits use sliding window counters. Admission is O(1), allocation-free
+    and integer-only. The counts
+    behind ``get_stats`` live in two rings of ``_RING_SLOTS`` buckets:
+    requests per second over the last minute and requests per minute over
+    the last hour.
+    """
+    burst_credit: int
+    minute: SlidingWindowCounter
+    hour: SlidingWindowCounter
+    last_refill_ns: int
+    sec_ring: List[int] = field(default_factory=lambda: [0] * _RING_SLOTS)
+    sec_head: int = 0
+    min_ring: List[int] = field(default_factory=lambda: [0] * _RING_SLOTS)
+    min_head: int = 0
+    
+    @staticmethod
+    def _advance(ring: List[int], head: int, index: int) -> int:
+        """Zero the slots between ``head`` and ``index``; return the new head."""
+        gap = index - head
+        if gap >= _RING_SLOTS:
+            ring[:] = [0] * _RING_SLOTS
+        else:
+            for slot in range(head + 1, index + 1):
+                ring[slot % _RING_SLOTS] = 0
+        return max(head, index)
+    
+    def _advance_to(self, now_ns: int):
+        """Rotate both rings up to ``now_ns``."""
+        second = now_ns // _NS_PER_SECOND
+        self.sec_head = self._advance(self.sec_ring, self.sec_head, second)
+        self.min_head = self._advance(self.min_ring, self.min_head, second // 60)
+    
+    def count_request(self, now_ns: int):
+        """Count a request in the current second and minute buckets."""
+        self._advance_to(now_ns)
+        self.sec_ring[self.sec_head % _RING_SLOTS] += 1
+        self.min_ring[self.min_head % _RING_SLOTS] += 1
+    
+    def get_recent_requests(self, window_seconds: int, now_ns: int) -> int:
+        """Get number of requests in the last ``window_seconds`` (at bucket granularity)."""
+        self._advance_to(now_ns)
+        if window_seconds >= 3600:
+            return sum(self.min_ring)
+        if window_seconds >= 60:
+            return sum(self.sec_ring)
+        head = self.sec_head
+        return sum(self.sec_ring[(head - i) % _RING_SLOTS] for i in range(window_seconds))
 
 
 class RateLimiter:
     """Rate limiter for requests per IP/session."""
     
-    def __init__(self, config: RateLimitConfig):
+    def __init__(self, config: RateLimitConfig, clock: Callable[[], int] = time.monotonic_ns):
         self.config = config
+        # Integer nanosecond clock; tests inject a fake one
+        self._clock = clock
         self.logger = get_logger("motive_proxy.rate_limiter")
-        self._limits: Dict[str, RateLimitEntry] = defaultdict(RateLimitEntry)
-        self._lock = asyncio.Lock()
+        # No method awaits between reading and updating an entry, so on the
+        # event loop's single thread no lock is needed around the dict
+        self._limits: Dict[str, RateLimitEntry] = {}
+        # Table size that triggers the next stale sweep
+        self._sweep_at = config.max_ips
+    
+    def _new_entry(self, now_ns: int) -> RateLimitEntry:
+        """Create an entry with a full burst bucket and empty windows."""
+        second = now_ns // _NS_PER_SECOND
+        return RateLimitEntry(
+            burst_credit=self.config.burst_capacity,
+            minute=SlidingWindowCounter(_MINUTE_NS, now_ns),
+            hour=SlidingWindowCounter(_HOUR_NS, now_ns),
+            last_refill_ns=now_ns,
+            sec_head=second,
+            min_head=second // 60,
+        )
     
     async def is_allowed(self, identifier: str) -> tuple[bool, Optional[str]]:
         """
@@ -57,70 +185,115 @@ class RateLimiter:
         Returns:
             (is_allowed, reason_if_blocked)
         """
-        async with self._lock:
-            current_time = time.time()
-            entry = self._limits[identifier]
-            
-            # Add current request
-            entry.add_request(current_time)
-            
-            # Check burst limit (last 10 seconds)
-            recent_requests = entry.get_recent_requests(10, current_time)
-            if recent_requests > self.config.burst_limit:
-                self.logger.warning("Rate limit exceeded: burst limit", 
-                                  identifier=identifier,
-                                  recent_requests=recent_requests,
-                                  limit=self.config.burst_limit)
-                return False, "Burst limit exceeded"
-            
-            # Check per-minute limit
-            minute_requests = entry.get_recent_requests(60, current_time)
-            if minute_requests > self.config.requests_per_minute:
-                self.logger.warning("Rate limit exceeded: per minute", 
-                                  identifier=identifier,
-                                  minute_requests=minute_requests,
-                                  limit=self.config.requests_per_minute)
-                return False, "Rate limit exceeded: too many requests per minute"
-            
-            # Check per-hour limit
-            hour_requests = entry.get_recent_requests(3600, current_time)
-            if hour_requests > self.config.requests_per_hour:
-                self.logger.warning("Rate limit exceeded: per hour", 
-                                  identifier=identifier,
-                                  hour_requests=hour_requests,
-                                  limit=self.config.requests_per_hour)
-                return False, "Rate limit exceeded: too many requests per hour"
-            
-            return True, None
+        now_ns = self._clock()
+        config = self.config
+        limits = self._limits
+        entry = limits.get(identifier)
+        if entry is None:
+            if len(limits) >= self._sweep_at:
+                self._evict_stale(now_ns)
+            entry = limits[identifier] = self._new_entry(now_ns)
+        else:
+            # Lazy refill from the time since the last check
+            entry.burst_credit = min(
+                config.burst_capacity,
+                entry.burst_credit + (now_ns - entry.last_refill_ns) * config.burst_limit,
+            )
+            entry.last_refill_ns = now_ns
+        
+        entry.count_request(now_ns)
+        
+        # Check burst limit (last 10 seconds)
+        if entry.burst_credit < _BURST_WINDOW_NS:
+            self.logger.warning("Rate limit exceeded: burst limit", 
+                              identifier=identifier,
+                              limit=self.config.burst_limit)
+            return False, "Burst limit exceeded"
+        
+        # Check per-minute limit
+        if entry.minute.is_full(now_ns, config.minute_limit_ns):
+            self.logger.warning("Rate limit exceeded: per minute", 
+                              identifier=identifier,
+                              limit=self.config.requests_per_minute)
+            return False, "Rate limit exceeded: too many requests per minute"
+        
+        # Check per-hour limit
+        if entry.hour.is_full(now_ns, config.hour_limit_ns):
+            self.logger.warning("Rate limit exceeded: per hour", 
+                              identifier=identifier,
+                              limit=self.config.requests_per_hour)
+            return False, "Rate limit exceeded: too many requests per hour"
+        
+        # Admitted requests take a burst token and count in both windows
+        entry.burst_credit -= _BURST_WINDOW_NS
+        entry.minute.curr += 1
+        entry.hour.curr += 1
+        return True, None
+    
+    async def retry_after(self, identifier: str) -> float:
+        """Seconds until ``identifier`` can next be admitted (0.0 if it can now)."""
+        entry = self._limits.get(identifier)
+        if entry is None:
+            return 0.0
+        now_ns = self._clock()
+        config = self.config
+        credit = entry.burst_credit + (now_ns - entry.last_refill_ns) * config.burst_limit
+        return max(
+            (_BURST_WINDOW_NS - credit) / config.burst_limit / _NS_PER_SECOND,
+            entry.minute.retry_after(now_ns, config.requests_per_minute),
+            entry.hour.retry_after(now_ns, config.requests_per_hour),
+            0.0,
+        )
     
     async def get_stats(self, identifier: str) -> Dict[str, int]:
         """Get rate limit statistics for an identifier."""
-        async with self._lock:
-            current_time = time.time()
-            entry = self._limits.get(identifier, RateLimitEntry())
-            
-            return {
-                "requests_last_minute": entry.get_recent_requests(60, current_time),
-                "requests_last_hour": entry.get_recent_requests(3600, current_time),
-                "requests_last_10_seconds": entry.get_recent_requests(10, current_time),
-                "total_tracked_requests": len(entry.requests),
-            }
+        now_ns = self._clock()
+        entry = self._limits.get(identifier)
+        if entry is None:
+            entry = self._new_entry(now_ns)
+        
+        hour_requests = entry.get_recent_requests(3600, now_ns)
+        return {
+            "requests_last_minute": entry.get_recent_requests(60, now_ns),
+            "requests_last_hour": hour_requests,
+            "requests_last_10_seconds": entry.get_recent_requests(10, now_ns),
+            "total_tracked_requests": hour_requests,
+        }
+    
+    def _evict_stale(self, now_ns: int, max_idle_ns: int = _MAX_WINDOW_NS) -> int:
+        """Drop entries idle for longer than ``max_idle_ns``.
+        
+        Live entries are never touched. If the sweep leaves the table over
+        its limit, the next sweep waits until the table has doubled so a
+        table full of live entries is not rescanned on every insert.
+        """
+        limits = self._limits
+        cutoff_ns = now_ns - max_idle_ns
+        to_remove = [
+            identifier for identifier, entry in limits.items()
+            if entry.last_refill_ns < cutoff_ns
+        ]
+        for identifier in to_remove:
+            del limits[identifier]
+        self._sweep_at = max(self.config.max_ips, 2 * len(limits))
+        return len(to_remove)
+    
+    def reset(self) -> None:
+        """Forget every identifier's history (e.g. between tests sharing a limiter)."""
+        self._limits.clear()
+        self._sweep_at = self.config.max_ips
     
     async def cleanup_old_entries(self):
-        """Clean up old rate limit entries."""
-        async with self._lock:
-            current_time = time.time()
-            cutoff_time = current_time - 7200  # 2 hours
-            
-            # Remove entries that haven't been used recently
-            to_remove = []
-            for identifier, entry in self._limits.items():
-                if not entry.requests or entry.requests[-1] < cutoff_time:
-                    to_remove.append(identifier)
-            
-            for identifier in to_remove:
-                del self._limits[identifier]
-            
-            if to_remove:
-                self.logger.info("Cleaned up old rate limit entries", 
-                               removed_count=len(to_remove))
+        """Clean up old rate limit entries.
+        
+        Runs without awaiting, so no bucket update can interleave with the
+        sweep.
+        """
+        now_ns = self._clock()
+        
+        # Remove entries that haven't been used in 2 hours
+        removed_count = self._evict_stale(now_ns, max_idle_ns=2 * _HOUR_NS)
+        
+        if removed_count:
+            self.logger.info("Cleaned up old rate limit entries", 
+                           removed_count=removed_count)
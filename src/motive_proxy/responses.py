@@ -0,0 +1,25 @@
+"""JSON response class backed by orjson when it is installed."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:  # Optional speedup; stdlib json is used without it
+    _HAS_ORJSON = False
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` that renders with orjson, falling back to stdlib json.
+
+    Only for routes without a ``response_model``: those are already
+    serialized straight to bytes by pydantic, and setting a response class
+    on them would disable that path.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if not _HAS_ORJSON:
+            return super().render(content)
+        return orjson.dumps(content)
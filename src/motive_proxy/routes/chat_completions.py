@@ -15,7 +15,9 @@ from motive_proxy.streaming import StreamingSession
 
 router = APIRouter()
 
-@router.post("/v1/chat/completions")
+# With a response_model FastAPI serializes the result straight to JSON bytes
+# through pydantic-core; StreamingResponse returns bypass it untouched.
+@router.post("/v1/chat/completions", response_model=ChatCompletionResponse)
 async def chat_completions(request: ChatCompletionRequest, fastapi_request: Request):
     """
     OpenAI Chat Completions API endpoint.
@@ -5,9 +5,10 @@ import time
 import psutil
 
 from motive_proxy.observability import get_logger, get_metrics_collector
+from motive_proxy.responses import FastJSONResponse
 from motive_proxy.settings import get_settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @router.get("/health")
@@ -99,8 +100,4 @@ async def get_metrics():
     logger = get_logger("motive_proxy.metrics")
     logger.debug("Metrics endpoint accessed")
     
-    metrics_collector = get_metrics_collector()
-    return {
-        "counters": metrics_collector.get_counters(),
-        "timers": metrics_collector.get_timers(),
-    }
+    return get_metrics_collector().snapshot()
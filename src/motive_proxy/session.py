@@ -7,9 +7,14 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, field
+import sys
 import time
 from enum import Enum
-from typing import Optional
+from typing import Callable, Dict, List, Optional
+
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get a regular class
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class Side(str, Enum):
@@ -17,7 +22,7 @@ class Side(str, Enum):
     B = "B"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Session:
     """Represents a bidirectional session with turn-based message exchange.
 
@@ -25,11 +30,19 @@ class Session:
     - First request for a new session is Side A (handshake). Its content is ignored.
     - Second request is Side B's first real message; it completes A's handshake.
     - Thereafter, requests alternate A/B. Each request returns the other side's next message.
+
+    Slotted on Python 3.10+ so that large session tables carry no per-instance
+    ``__dict__``.
     """
 
     session_id: str
     handshake_timeout_seconds: float = 30.0
     turn_timeout_seconds: float = 30.0
+    # Monotonic source of the activity timestamps; tests inject a fake clock
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+
+    # Set once the first request has registered as Side A
+    first_client_connected: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
 
     # Internal state
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
@@ -41,8 +54,29 @@ class Session:
     # Buffers to handle out-of-order sends when counterpart isn't yet waiting
     _buffer_for_a: Optional[str] = field(default=None, init=False, repr=False)
     _buffer_for_b: Optional[str] = field(default=None, init=False, repr=False)
-    _created_ts: float = field(default_factory=lambda: time.time(), init=False, repr=False)
-    _last_activity_ts: float = field(default_factory=lambda: time.time(), init=False, repr=False)
+    _created_ts: float = field(default=0.0, init=False, repr=False)
+    _last_activity_ts: float = field(default=0.0, init=False, repr=False)
+    # One-shot callbacks fired the next time a side parks waiting for its counterpart
+    _waiter_callbacks: Dict[Side, List[Callable[[], None]]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # created_ts is wall-clock for admin display; activity stays monotonic
+        # so TTL arithmetic is immune to clock jumps
+        self._created_ts = time.time()
+        self._last_activity_ts = self.clock()
+
+    @property
+    def last_activity_ts(self) -> float:
+        """When the session last handled a request, on ``clock()``'s timescale."""
+        return self._last_activity_ts
+
+    def add_waiter_callback(self, side: Side, callback: Callable[[], None]) -> None:
+        """Register a one-shot callback fired the next time ``side`` blocks waiting."""
+        self._waiter_callbacks.setdefault(side, []).append(callback)
+
+    def _notify_waiting(self, side: Side) -> None:
+        for callback in self._waiter_callbacks.pop(side, ()):
+            callback()
 
     async def process_request(self, content: str, sender_side: Optional[Side] = None) -> str:
         """Process an incoming request content and wait for counterpart reply.
@@ -53,7 +87,7 @@ class Session:
         # Determine behavior under lock and produce a future to await afterward
         async with self._lock:
             loop = asyncio.get_running_loop()
-            self._last_activity_ts = time.time()
+            self._last_activity_ts = self.clock()
 
             if not self._side_a_connected:
                 # First ever request → becomes A handshake; ignore content; wait for B
@@ -62,6 +96,8 @@ class Session:
                 wait_future = self._pending_for_a
                 timeout = self.handshake_timeout_seconds
                 self._next_expected = Side.B
+                self.first_client_connected.set()
+                self._notify_waiting(Side.A)
                 # Return future to wait outside lock
                 # A's content is not forwarded
                 pass
@@ -74,6 +110,7 @@ class Session:
                 # Now B waits for A's next
                 self._pending_for_b = loop.create_future()
                 wait_future = self._pending_for_b
+                self._notify_waiting(Side.B)
                 timeout = self.turn_timeout_seconds
                 self._next_expected = Side.A
             else:
@@ -96,6 +133,7 @@ class Session:
                     else:
                         self._pending_for_a = loop.create_future()
                         wait_future = self._pending_for_a
+                        self._notify_waiting(Side.A)
                     timeout = self.turn_timeout_seconds
                     self._next_expected = Side.B
                 else:
@@ -115,18 +153,32 @@ class Session:
                     else:
                         self._pending_for_b = loop.create_future()
                         wait_future = self._pending_for_b
+                        self._notify_waiting(Side.B)
                     timeout = self.turn_timeout_seconds
                     self._next_expected = Side.A
 
         # Wait outside the lock to avoid deadlocks
         return await asyncio.wait_for(wait_future, timeout=timeout)
 
-    def metadata(self) -> dict:
-        """Return minimal, non-sensitive metadata for admin queries."""
+    def cancel_pending(self) -> None:
+        """Cancel any futures still waiting on a counterpart message."""
+        for fut in (self._pending_for_a, self._pending_for_b):
+            if fut is not None and not fut.done():
+                fut.cancel()
+
+    def metadata(self, wall_offset: Optional[float] = None) -> dict:
+        """Return minimal, non-sensitive metadata for admin queries.
+
+        ``wall_offset`` is wall-clock time minus ``clock()``; callers listing
+        many sessions read both clocks once and pass it in.
+        """
+        if wall_offset is None:
+            wall_offset = time.time() - self.clock()
         return {
             "session_id": self.session_id,
             "created_ts": self._created_ts,
-            "last_activity_ts": self._last_activity_ts,
+            # Converted to wall-clock only here; metadata reads are rare
+            "last_activity_ts": self._last_activity_ts + wall_offset,
         }
 
 
@@ -3,9 +3,17 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, List
+import contextlib
+import heapq
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
-from motive_proxy.session import Session
+from motive_proxy.observability import get_logger, get_metrics_collector
+from motive_proxy.session import Session, Side
+
+# Floor on the expiry task's sleep, so an entry expiring exactly now cannot spin it
+_MIN_GC_DELAY_SECONDS = 0.01
 
 
 class SessionManager:
@@ -14,49 +22,211 @@ class SessionManager:
     def __init__(self,
                  handshake_timeout_seconds: float = 30.0,
                  turn_timeout_seconds: float = 30.0,
-                 max_sessions: int = 100) -> None:
+                 max_sessions: int = 100,
+                 clock: Callable[[], float] = time.monotonic,
+                 session_ttl_seconds: Optional[float] = None,
+                 cleanup_interval_seconds: float = 60.0) -> None:
         self._sessions: Dict[str, Session] = {}
+        # (last activity seen, session id) min-heap for cleanup_expired. Entries
+        # go stale when a session is active again or closed; they are checked
+        # against the live session when popped rather than updated in place.
+        self._activity_heap: List[Tuple[float, str]] = []
+        # Waiter callbacks registered before their session exists
+        self._pending_callbacks: Dict[str, List[Tuple[Side, Callable[[], None]]]] = {}
+        # When each pending entry was first registered; entries whose session
+        # never appears are dropped by cleanup_expired like idle sessions
+        self._pending_since: Dict[str, float] = {}
         self._lock = asyncio.Lock()
         self._handshake_timeout = handshake_timeout_seconds
         self._turn_timeout = turn_timeout_seconds
         self._max_sessions = max_sessions
+        self._clock = clock
+        # When set, get_or_create replaces sessions idle longer than this and
+        # start() runs a background task expiring them
+        self._ttl = session_ttl_seconds
+        # Longest expiry task sleep while there are no sessions to wait on;
+        # capped at the TTL so a session created meanwhile is not overlooked
+        self._cleanup_interval = cleanup_interval_seconds
+        self._gc_task: Optional[asyncio.Task] = None
 
     async def get_or_create(self, session_id: str) -> Session:
-        """Get or create a session safely under a lock."""
+        """Get or create a session safely under a lock.
+
+        With a session TTL configured, a session found idle past it is
+        dropped and replaced, without waiting for ``cleanup_expired``.
+        Idle time is recorded on every hit and on every eviction, so the TTL
+        can be tuned against how long sessions actually sit idle.
+        """
         async with self._lock:
             session = self._sessions.get(session_id)
             if session is not None:
-                return session
+                idle = self._clock() - session.last_activity_ts
+                if self._ttl is None or idle <= self._ttl:
+                    get_metrics_collector().record_timer("session_idle_on_get", idle)
+                    return session
+                get_metrics_collector().record_timer("session_age_on_eviction", idle)
+                session.cancel_pending()
+                del self._sessions[session_id]
             if len(self._sessions) >= self._max_sessions:
                 # Simple guard; more graceful error handling can be added later
                 raise RuntimeError("Max sessions limit reached")
+            # The table key and Session.session_id share one interned string
+            session_id = sys.intern(session_id)
             session = Session(
                 session_id=session_id,
                 handshake_timeout_seconds=self._handshake_timeout,
                 turn_timeout_seconds=self._turn_timeout,
+                clock=self._clock,
             )
+            self._pending_since.pop(session_id, None)
+            for side, callback in self._pending_callbacks.pop(session_id, ()):
+                session.add_waiter_callback(side, callback)
             self._sessions[session_id] = session
+            heapq.heappush(self._activity_heap, (session.last_activity_ts, session_id))
             return session
 
+    def start(self) -> None:
+        """Start the background task expiring sessions idle past the session TTL."""
+        if self._ttl is not None and self._gc_task is None:
+            self._gc_task = asyncio.create_task(self._gc_loop())
+
+    async def aclose(self) -> None:
+        """Stop the background expiry task."""
+        task, self._gc_task = self._gc_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def __aenter__(self) -> "SessionManager":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def _gc_loop(self) -> None:
+        """Sleep until the least recently active session could expire, then sweep."""
+        ttl = self._ttl
+        if ttl is None:
+            return  # start() only runs the loop with a TTL configured
+        logger = get_logger("motive_proxy.cleanup")
+        # Nothing pushed during an idle sleep can expire before this elapses
+        idle_delay = min(self._cleanup_interval, ttl)
+        try:
+            while True:
+                heap = self._activity_heap
+                if heap:
+                    delay = heap[0][0] + ttl - self._clock()
+                else:
+                    delay = idle_delay
+                await asyncio.sleep(max(delay, _MIN_GC_DELAY_SECONDS))
+                removed_count = await self.cleanup_expired(ttl)
+                if removed_count > 0:
+                    logger.info("Cleaned up expired sessions", removed_count=removed_count)
+        except asyncio.CancelledError:
+            logger.info("Cleanup task cancelled")
+
+    def add_waiter_callback(self, session_id: str, side: Side, callback: Callable[[], None]) -> None:
+        """Fire ``callback`` the next time ``side`` of ``session_id`` blocks waiting.
+
+        The session does not need to exist yet; the callback is attached when
+        it is created.
+        """
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.add_waiter_callback(side, callback)
+        else:
+            self._pending_callbacks.setdefault(session_id, []).append((side, callback))
+            self._pending_since.setdefault(session_id, self._clock())
+
     async def close(self, session_id: str) -> None:
+        """Remove a session and cancel its outstanding futures."""
         async with self._lock:
-            self._sessions.pop(session_id, None)
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.cancel_pending()
+
+    def reset(self) -> None:
+        """Drop all sessions and cancel their outstanding futures.
+
+        Lets a long-lived manager be reused (e.g. across tests) without
+        rebuilding it.
+        """
+        for session in self._sessions.values():
+            session.cancel_pending()
+        self._sessions.clear()
+        self._activity_heap.clear()
+        self._pending_callbacks.clear()
+        self._pending_since.clear()
+
+    # Reads never await, so they cannot interleave with a mutation and do not
+    # queue behind get_or_create or cleanup_expired for the lock
 
     async def count(self) -> int:
-        async with self._lock:
-            return len(self._sessions)
+        return len(self._sessions)
 
     async def list_sessions(self) -> List[dict]:
         """Return metadata for active sessions (redacted)."""
-        async with self._lock:
-            return [s.metadata() for s in self._sessions.values()]
+        # One clock reading for the whole listing
+        wall_offset = time.time() - self._clock()
+        return [s.metadata(wall_offset) for s in self._sessions.values()]
 
     async def cleanup_expired(self, ttl_seconds: float) -> int:
-        """Remove sessions idle longer than ttl_seconds. Returns count removed."""
-        import time
+        """Remove sessions idle longer than ttl_seconds. Returns count removed.
+
+        Only heap entries old enough to have expired are visited, so the cost
+        scales with the expired (or since-active) sessions, not all of them.
+        When neither the oldest heap entry nor the oldest pending callback is
+        past the cutoff, returns without taking the lock. Expired sessions are
+        torn down after the lock is released.
+        """
+        now = self._clock()
+        # Entries last active before this are expired
+        cutoff = now - ttl_seconds
+        if not self._has_expired(cutoff):
+            return 0
+        expired: Dict[str, Session] = {}
+        metrics = get_metrics_collector()
         async with self._lock:
-            now = time.time()
-            to_delete = [sid for sid, s in self._sessions.items() if (now - s._last_activity_ts) > ttl_seconds]
-            for sid in to_delete:
-                self._sessions.pop(sid, None)
-            return len(to_delete)
+            heap = self._activity_heap
+            sessions = self._sessions
+            while heap and heap[0][0] < cutoff:
+                seen_ts, sid = heapq.heappop(heap)
+                if sid in expired:
+                    continue  # Stale duplicate of an entry already expired
+                session = sessions.get(sid)
+                if session is None:
+                    continue  # Closed since this entry was pushed
+                last_activity = session.last_activity_ts
+                if last_activity != seen_ts:
+                    # Active since (or a recreated session): requeue at its real time
+                    heapq.heappush(heap, (last_activity, sid))
+                    continue
+                expired[sid] = session
+                metrics.record_timer("session_age_on_eviction", now - last_activity)
+            if len(expired) > len(sessions) // 4:
+                # Large batch: one C-level rebuild beats many point deletions
+                self._sessions = {sid: s for sid, s in sessions.items() if sid not in expired}
+            else:
+                for sid in expired:
+                    del sessions[sid]
+            # Registration order is time order, so stale entries are a prefix
+            pending_since = self._pending_since
+            while pending_since:
+                sid, since = next(iter(pending_since.items()))
+                if since >= cutoff:
+                    break
+                del pending_since[sid]
+                del self._pending_callbacks[sid]
+        for session in expired.values():
+            session.cancel_pending()
+        return len(expired)
+
+    def _has_expired(self, cutoff: float) -> bool:
+        """Whether the oldest session or pending callback is older than cutoff."""
+        heap = self._activity_heap
+        if heap and heap[0][0] < cutoff:
+            return True
+        pending_since = self._pending_since
+        return bool(pending_since) and next(iter(pending_since.values())) < cutoff
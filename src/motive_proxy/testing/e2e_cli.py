@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import math
 import subprocess
 import sys
 import time
@@ -14,6 +15,11 @@ import httpx
 from .scenarios import ScenarioManager, E2ETestScenario
 from .log_collector import LogCollector
 
+# How long a single client process may run before it is terminated
+_CLIENT_WAIT_TIMEOUT_SECONDS = 300.0
+# Upper bound on sessions driven at the same time
+_MAX_CONCURRENT_SESSIONS = 8
+
 
 @click.command()
 @click.option('--scenario', default='basic-handshake', help='Test scenario to run')
@@ -159,7 +165,6 @@ async def _run_e2e_test(
         log_collector.add_log("e2e-test", "info", "Server is ready")
         
         # Run test scenarios with independent client processes
-        session_results = []
         server_url = f"http://{server_host}:{server_port}"
         
         # For LLM runs, ensure clients have long HTTP timeouts too
@@ -167,14 +172,19 @@ async def _run_e2e_test(
         if use_llms and (client_timeout is None or client_timeout < 300):
             client_timeout = 300.0
 
+        # Sessions share client names, so give each its own output directory when fanned out
+        session_tasks = []
         for i in range(concurrent):
             session_id = f"test-session-{i}"
-            result = await _run_session_with_subprocesses(
+            session_output = output_path if concurrent == 1 else output_path / session_id
+            session_output.mkdir(parents=True, exist_ok=True)
+            session_tasks.append(_run_session_with_subprocesses(
                 session_id=session_id,
                 scenario=test_scenario,
                 server_url=server_url,
-                output_path=output_path,
+                output_path=session_output,
                 log_collector=log_collector,
+                client_processes=client_processes,
                 use_llms=use_llms,
                 llm_provider_a=llm_provider_a,
                 llm_model_a=llm_model_a,
@@ -185,8 +195,16 @@ async def _run_e2e_test(
                 max_context_messages=max_context_messages,
                 system_prompt=system_prompt,
                 client_timeout=client_timeout
-            )
-            session_results.append(result)
+            ))
+
+        # Each session's client timeouts only start once it gets a slot, so bound the
+        # whole batch by the number of waves rather than a single flat deadline.
+        limit = min(concurrent, _MAX_CONCURRENT_SESSIONS)
+        waves = math.ceil(concurrent / limit)
+        session_results = await asyncio.wait_for(
+            gather_with_limited_concurrency(limit, *session_tasks),
+            timeout=(_CLIENT_WAIT_TIMEOUT_SECONDS + 30.0) * waves,
+        )
         
         # Generate report
         report = {
@@ -220,6 +238,17 @@ async def _run_e2e_test(
         await _cleanup_processes(server_process, client_processes)
 
 
+async def gather_with_limited_concurrency(limit: int, *aws) -> List[Any]:
+    """Like ``asyncio.gather`` but run at most ``limit`` awaitables at once."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded(aw):
+        async with semaphore:
+            return await aw
+
+    return list(await asyncio.gather(*(_bounded(aw) for aw in aws)))
+
+
 async def _start_server(host: str, port: int, use_llms: bool = False) -> subprocess.Popen:
     """Start MotiveProxy server in background."""
     cmd = [sys.executable, "-m", "motive_proxy.cli", "run", "--host", host, "--port", str(port)]
@@ -275,6 +304,7 @@ async def _run_session_with_subprocesses(
     server_url: str,
     output_path: Path,
     log_collector: LogCollector,
+    client_processes: List[subprocess.Popen],
     use_llms: bool = False,
     llm_provider_a: str = 'google',
     llm_model_a: str = 'gemini-2.5-flash',
@@ -286,13 +316,15 @@ async def _run_session_with_subprocesses(
     system_prompt: Optional[str] = None,
     client_timeout: float = 60.0
 ) -> Dict[str, Any]:
-    """Run a session test with independent client subprocesses."""
+    """Run a session test with independent client subprocesses.
+
+    Client processes are appended to the caller's ``client_processes`` so they
+    are still cleaned up if this session is cancelled by the batch timeout.
+    """
     
     print(f"Starting session test: {session_id}")
     log_collector.add_log(session_id, "info", f"Starting session test: {session_id}")
     
-    client_processes = []
-    
     try:
         # Start Client A
         client_a_cmd = [
@@ -428,10 +460,9 @@ async def _wait_for_client(process: subprocess.Popen, client_name: str, log_coll
     try:
         # Wait for the process to complete with timeout
         # Use longer timeout for LLM tests since they take more time
-        timeout_seconds = 300.0  # 5 minutes for LLM conversations
         return_code = await asyncio.wait_for(
             asyncio.to_thread(process.wait),
-            timeout=timeout_seconds
+            timeout=_CLIENT_WAIT_TIMEOUT_SECONDS
         )
         
         if return_code == 0:
@@ -4,7 +4,11 @@ This module provides LLM client functionality for test clients,
 allowing real LLM conversations through MotiveProxy.
 """
 
+import asyncio
 import os
+import time
+from collections import deque
+from itertools import islice
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -29,26 +33,53 @@ except ImportError:
 class LLMTestClient:
     """LLM-enhanced test client for E2E testing with smart context management optimized for Gemini."""
     
-    def __init__(self, llm: BaseChatModel, max_context_messages: int = 10, max_response_length: int = 2000):
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        max_context_messages: int = 10,
+        max_response_length: int = 2000,
+        batch_size: int = 1,
+    ):
         """Initialize LLM test client.
         
         Args:
             llm: LangChain chat model instance
             max_context_messages: Maximum number of messages to keep in context
             max_response_length: Maximum length for LLM responses (characters)
+            batch_size: When greater than 1, concurrent ``process_message`` calls
+                are queued and up to this many are sent to the LLM together
         """
         self.llm = llm
-        self.conversation_history = []
+        self.batch_size = batch_size
+        # Created on first batched call so they bind to the running loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
         self.max_context_messages = max_context_messages
+        # Append-only audit log; _get_context_for_llm reads its tail
+        self._full_log: List = []
         self.max_response_length = max_response_length
         self.system_prompt = None
+        # Built once per prompt and reused on every turn
+        self._system_message: Optional[SystemMessage] = None
         
-        # Smart context management
+        # Smart context management; the summarizer trims the deque from the left
+        # instead of the list being re-sliced on every turn
         self.conversation_summary = ""
-        self.recent_messages = []
+        # Placeholder message for the summary, rebuilt only when it changes
+        self._summary_message: Optional[HumanMessage] = None
+        self.recent_messages: deque = deque()
         self.response_cache = {}
         self.summary_threshold = 8  # When to create summary
     
+    @property
+    def conversation_history(self) -> List:
+        """Every message exchanged so far, oldest first."""
+        return self._full_log
+    
+    @conversation_history.setter
+    def conversation_history(self, messages: List):
+        self._full_log = list(messages)
+    
     def set_system_prompt(self, prompt: str):
         """Set a system prompt for the conversation.
         
@@ -56,6 +87,20 @@ class LLMTestClient:
             prompt: System prompt to use for context
         """
         self.system_prompt = prompt
+        self._system_message = SystemMessage(content=prompt) if prompt else None
+    
+    def _get_context_for_llm(self) -> List:
+        """Return the system prompt (if any) followed by the last ``max_context_messages`` messages."""
+        context = [self._system_message] if self._system_message else []
+        if self.max_context_messages > 0:
+            # Negative slice copies only the tail, not the whole log
+            context.extend(self._full_log[-self.max_context_messages:])
+        return context
+    
+    def _recent_tail(self, count: int) -> List:
+        """Return the last ``count`` recent messages without copying the rest."""
+        start = max(len(self.recent_messages) - count, 0)
+        return list(islice(self.recent_messages, start, None))
     
     def _build_smart_context(self, message: str) -> List:
         """Build optimized context for Gemini with smart truncation.
@@ -69,35 +114,35 @@ class LLMTestClient:
         context = []
         
         # Always include system prompt if available
-        if self.system_prompt:
-            context.append(SystemMessage(content=self.system_prompt))
+        if self._system_message:
+            context.append(self._system_message)
         
         # Add conversation summary if we have old history
-        if self.conversation_summary:
-            context.append(HumanMessage(content=f"[Previous context: {self.conversation_summary}]"))
+        if self._summary_message:
+            context.append(self._summary_message)
         
         # Add recent messages (last 3-4 for optimal performance)
-        context.extend(self.recent_messages[-4:])
+        context.extend(self._recent_tail(4))
         
         # Add new message
         context.append(HumanMessage(content=message))
         
         return context
     
-    def _update_context(self, message: str, response: str):
+    def _update_context(self, human: HumanMessage, ai: AIMessage):
         """Update conversation context efficiently.
         
         Args:
-            message: User message
-            response: LLM response
+            human: User message, as already sent in the LLM context
+            ai: LLM response message
         """
         # Add to recent messages
-        self.recent_messages.append(HumanMessage(content=message))
-        self.recent_messages.append(AIMessage(content=response))
+        self.recent_messages.append(human)
+        self.recent_messages.append(ai)
         
         # Add to full history for logging
-        self.conversation_history.append(HumanMessage(content=message))
-        self.conversation_history.append(AIMessage(content=response))
+        self._full_log.append(human)
+        self._full_log.append(ai)
         
         # Create summary when we have too many recent messages
         if len(self.recent_messages) > self.summary_threshold:
@@ -110,7 +155,7 @@ class LLMTestClient:
         
         # Keep only the last 2 messages in recent_messages
         # and summarize the rest
-        old_messages = self.recent_messages[:-2]
+        old_messages = list(islice(self.recent_messages, len(self.recent_messages) - 2))
         
         # Simple summarization (could be enhanced with LLM summarization)
         if len(old_messages) > 0:
@@ -120,10 +165,14 @@ class LLMTestClient:
                     summary_parts.append(f"Turn {i+1}: {msg.content[:100]}...")
             
             if summary_parts:
-                self.conversation_summary = " | ".join(summary_parts)
+                summary = " | ".join(summary_parts)
+                if summary != self.conversation_summary:
+                    self.conversation_summary = summary
+                    self._summary_message = HumanMessage(content=f"[Previous context: {summary}]")
         
         # Keep only last 2 messages
-        self.recent_messages = self.recent_messages[-2:]
+        while len(self.recent_messages) > 2:
+            self.recent_messages.popleft()
     
     async def process_message(self, message: str) -> str:
         """Process an incoming message and return LLM response with smart context.
@@ -134,14 +183,15 @@ class LLMTestClient:
         Returns:
             LLM response message
         """
-        import time
-        
         # Check cache first (simple hash-based caching)
-        cache_key = hash(message + str(self.recent_messages[-2:]) if len(self.recent_messages) >= 2 else message)
+        cache_key = hash(message + str(self._recent_tail(2)) if len(self.recent_messages) >= 2 else message)
         if cache_key in self.response_cache:
             print(f"🚀 Cache hit! Using cached response")
             return self.response_cache[cache_key]
         
+        if self.batch_size > 1:
+            return await self._enqueue(message, cache_key)
+        
         # Build optimized context
         context = self._build_smart_context(message)
         
@@ -160,27 +210,90 @@ class LLMTestClient:
         if response_time > 20:
             print(f"⚠️  Slow response detected: {response_time:.2f}s")
         
+        # The context ends with the new message; record that same object
+        return self._finish_turn(context[-1], cache_key, response)
+    
+    def _finish_turn(self, human: HumanMessage, cache_key: int, response) -> str:
+        """Truncate the LLM reply, record the turn and cache it."""
         # Truncate response if too long
         response_content = response.content
         if len(response_content) > self.max_response_length:
             response_content = response_content[:self.max_response_length] + "..."
             print(f"⚠️  Response truncated to {self.max_response_length} characters")
+            ai = AIMessage(content=response_content)
+        elif isinstance(response, AIMessage):
+            # Keep the model's own message rather than building a copy of it
+            ai = response
+        else:
+            ai = AIMessage(content=response_content)
         
         # Update context efficiently
-        self._update_context(message, response_content)
+        self._update_context(human, ai)
         
         # Cache response
         self.response_cache[cache_key] = response_content
         
         return response_content
     
+    async def _enqueue(self, message: str, cache_key: int) -> str:
+        """Hand a turn to the batch worker and wait for its reply."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker_task is None or self._worker_task.done():
+            # Restart on the same queue so turns already waiting are still served
+            self._worker_task = asyncio.create_task(self._batch_worker())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, cache_key, future))
+        return await future
+    
+    async def _batch_worker(self):
+        """Drain up to ``batch_size`` queued turns and invoke the LLM for them concurrently.
+        
+        Every turn in a batch is built against the context as it stood before
+        the batch; replies are recorded in the order the turns were queued.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            contexts = [self._build_smart_context(message) for message, _, _ in batch]
+            print(f"🤖 LLM processing batch of {len(batch)}...")
+            results = await asyncio.gather(
+                *(self.llm.ainvoke(context) for context in contexts),
+                return_exceptions=True,
+            )
+            
+            for (_, cache_key, future), context, result in zip(batch, contexts, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                    continue
+                try:
+                    future.set_result(self._finish_turn(context[-1], cache_key, result))
+                except Exception as exc:
+                    # Fail this turn only; the worker keeps serving the queue
+                    future.set_exception(exc)
+    
+    async def aclose(self):
+        """Stop the batch worker, if one was started."""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+            self._queue = None
+    
     def get_conversation_history(self) -> list:
         """Get the full conversation history.
         
         Returns:
             List of conversation messages
         """
-        return self.conversation_history.copy()
+        return self._full_log.copy()
     
     def get_context_summary(self) -> Dict[str, Any]:
         """Get summary of current context usage.
@@ -188,15 +301,21 @@ class LLMTestClient:
         Returns:
             Dictionary with context statistics
         """
-        total_messages = len(self.conversation_history)
-        context_messages = len(self._build_smart_context(""))
+        # Size of what _build_smart_context would send (system prompt, summary,
+        # recent tail and the new message), read without building the list
+        context_messages = (
+            (self._system_message is not None)
+            + (self._summary_message is not None)
+            + min(len(self.recent_messages), 4)
+            + 1
+        )
         
         return {
-            'total_messages': total_messages,
+            'total_messages': len(self._full_log),
             'context_messages': context_messages,
             'max_context_messages': self.max_context_messages,
             'context_usage_percent': (context_messages / self.max_context_messages) * 100 if self.max_context_messages > 0 else 0,
-            'has_system_prompt': self.system_prompt is not None,
+            'has_system_prompt': self._system_message is not None,
             'has_conversation_summary': bool(self.conversation_summary),
             'recent_messages_count': len(self.recent_messages),
             'cache_size': len(self.response_cache)
@@ -204,11 +323,13 @@ class LLMTestClient:
     
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history.clear()
+        self._full_log.clear()
         self.recent_messages.clear()
         self.conversation_summary = ""
+        self._summary_message = None
         self.response_cache.clear()
         self.system_prompt = None
+        self._system_message = None
 
 
 def create_llm_client(
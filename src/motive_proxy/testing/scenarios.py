@@ -1,12 +1,17 @@
 """Test scenarios for E2E testing."""
 
+import functools
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class E2ETestScenario:
-    """Represents a test scenario with steps."""
+    """Represents a test scenario with steps.
+    
+    Frozen because the predefined scenarios are built once and shared by
+    every ``ScenarioManager``.
+    """
     name: str
     description: str
     steps: List[Dict[str, Any]]
@@ -19,9 +24,22 @@ class ScenarioManager:
     
     def __init__(self):
         """Initialize scenario manager with predefined scenarios."""
-        self.scenarios = self._create_predefined_scenarios()
+        # Copy so add_scenario() on one manager does not leak into the shared defaults
+        self._scenarios = dict(self._load_default_scenarios())
+    
+    @property
+    def scenarios(self) -> Dict[str, E2ETestScenario]:
+        """Scenarios registered on this manager, keyed by name."""
+        return self._scenarios
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_default_scenarios(cls) -> Dict[str, E2ETestScenario]:
+        """Build the predefined scenarios once per class."""
+        return cls._create_predefined_scenarios()
     
-    def _create_predefined_scenarios(self) -> Dict[str, E2ETestScenario]:
+    @staticmethod
+    def _create_predefined_scenarios() -> Dict[str, E2ETestScenario]:
         """Create predefined test scenarios."""
         scenarios = {}
         
@@ -3,14 +3,16 @@
 import asyncio
 import json
 import time
-from typing import Optional, Dict, Any, List, AsyncGenerator
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, AsyncGenerator
 from dataclasses import dataclass
 from datetime import datetime
 
 import httpx
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 
 @dataclass
 class TestClientConfig:
@@ -30,7 +32,7 @@ class TestClient:
         """Initialize test client with configuration."""
         self.config = config
         self.client: Optional[httpx.AsyncClient] = None
-        self.langchain_client: Optional[ChatOpenAI] = None
+        self.langchain_client: Optional["ChatOpenAI"] = None
         self.session_id: Optional[str] = None
         self.connected = False
         self.messages: List[Dict[str, Any]] = []
@@ -58,7 +60,9 @@ class TestClient:
             headers={"Authorization": f"Bearer {self.config.api_key}"}
         )
         
-        # Create LangChain client pointing to MotiveProxy
+        # Create LangChain client pointing to MotiveProxy; imported here because
+        # langchain_openai is slow to import and only needed once connected
+        from langchain_openai import ChatOpenAI
         self.langchain_client = ChatOpenAI(
             base_url=f"{self.config.base_url}/v1",
             api_key=self.config.api_key,
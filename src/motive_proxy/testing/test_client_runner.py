@@ -11,6 +11,7 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
+from types import ModuleType
 from typing import Optional, Dict, Any
 
 import click
@@ -20,6 +21,16 @@ from motive_proxy.session import Side
 
 from .llm_client import LLMTestClient, create_llm_client
 
+uvloop: Optional[ModuleType]
+try:
+    # Installed with uvicorn[standard] everywhere except Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Drive the client's LLM turns on uvloop when it is available
+_run_event_loop = uvloop.run if uvloop is not None and hasattr(uvloop, "run") else asyncio.run
+
 
 def safe_print(text: str) -> None:
     """Print text safely, handling encoding issues with emojis."""
@@ -152,7 +163,7 @@ def main(
                 sys.exit(1)
         
         # Run the test client
-        result = asyncio.run(_run_test_client(
+        result = _run_event_loop(_run_test_client(
             name=name,
             server_url=server_url,
             session_id=session_id,
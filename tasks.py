@@ -15,9 +15,11 @@ def install(c):
 
 
 @task
-def test(c, verbose=False):
-    """Run tests with pytest."""
+def test(c, verbose=False, slow=False):
+    """Run tests with pytest; tests marked slow only run with --slow."""
     cmd = "pytest"
+    if not slow:
+        cmd += ' -m "not slow"'
     if verbose:
         cmd += " -v"
     print("🧪 Running tests...")
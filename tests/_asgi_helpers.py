@@ -0,0 +1,32 @@
+"""Lightweight helpers for driving the ASGI app in tests without an AsyncClient."""
+
+import weakref
+from typing import Any, Dict, Union
+
+import httpx
+
+# One transport per app for the whole test session
+_transports: "weakref.WeakKeyDictionary[Any, httpx.ASGITransport]" = weakref.WeakKeyDictionary()
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _transport_for(app) -> httpx.ASGITransport:
+    transport = _transports.get(app)
+    if transport is None:
+        transport = httpx.ASGITransport(app=app)
+        _transports[app] = transport
+    return transport
+
+
+async def asgi_post_json(app, path: str, body: Union[Dict[str, Any], bytes]) -> httpx.Response:
+    """POST ``body`` as JSON to ``path`` straight through the app's ASGI transport.
+
+    ``body`` may be a dict or an already-encoded JSON payload.
+    """
+    if isinstance(body, bytes):
+        request = httpx.Request("POST", f"http://t{path}", content=body, headers=_JSON_HEADERS)
+    else:
+        request = httpx.Request("POST", f"http://t{path}", json=body)
+    response = await _transport_for(app).handle_async_request(request)
+    await response.aread()
+    return response
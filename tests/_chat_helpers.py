@@ -0,0 +1,32 @@
+"""Shared helpers for posting OpenAI-style chat requests in tests."""
+
+import asyncio
+import json
+
+import httpx
+
+from tests._asgi_helpers import asgi_post_json
+
+CHAT_PATH = "/v1/chat/completions"
+
+_BODY_TMPL = b'{"model":"%s","messages":[{"role":"user","content":%s}],"stream":false}'
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def chat_body(model: str, content: str) -> bytes:
+    """Encode a single-message, non-streaming chat request."""
+    return _BODY_TMPL % (model.encode(), json.dumps(content).encode())
+
+
+async def post_chat(client, model: str, content: str, timeout: float = 5.0) -> httpx.Response:
+    """Post one user message as ``model``.
+
+    ``client`` is either an ``httpx.AsyncClient`` or an ASGI app, which is
+    driven through the cached transport in ``tests._asgi_helpers``. Either
+    way the request is bounded by ``timeout`` seconds.
+    """
+    body = chat_body(model, content)
+    if isinstance(client, httpx.AsyncClient):
+        return await client.post(CHAT_PATH, content=body, headers=_JSON_HEADERS, timeout=timeout)
+    # The transport is called directly, so httpx's own timeouts never apply
+    return await asyncio.wait_for(asgi_post_json(client, CHAT_PATH, body), timeout=timeout)
@@ -0,0 +1,17 @@
+"""Deterministic clock for tests that inspect session timestamps."""
+
+
+class FakeClock:
+    """Callable clock that only moves when ``advance`` is called."""
+
+    def __init__(self, start: float = 1000.0):
+        self._now = start
+
+    def __call__(self) -> float:
+        return self._now
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += seconds
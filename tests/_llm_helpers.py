@@ -0,0 +1,27 @@
+"""Shared test double for LLM chat models."""
+
+from typing import Any, Callable, List, Optional
+
+from langchain_core.messages import AIMessage
+
+
+class FakeLLM:
+    """Chat-model stand-in: records calls and replays queued or computed replies.
+
+    ``ainvoke`` pops the next reply queued on ``responses``; once the queue is
+    empty it returns ``reply(messages)`` if a callable was given, else an
+    empty ``AIMessage``.
+    """
+
+    def __init__(self, reply: Optional[Callable[[List[Any]], Any]] = None):
+        self.calls: List[List[Any]] = []
+        self.responses: List[Any] = []
+        self.reply = reply
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        if self.responses:
+            return self.responses.pop(0)
+        if self.reply is not None:
+            return self.reply(messages)
+        return AIMessage(content="")
@@ -0,0 +1,34 @@
+"""Structured task handling for tests that must also run before Python 3.11."""
+
+import asyncio
+from typing import Any, Awaitable, List
+
+
+class TaskScope:
+    """Minimal ``asyncio.TaskGroup`` stand-in built on ``asyncio.gather``.
+
+    On a clean exit every task is awaited and the first failure (other than a
+    cancellation) is re-raised. If the body raises, unfinished tasks are
+    cancelled and reaped so no request outlives the test.
+    """
+
+    def __init__(self):
+        self._tasks: List["asyncio.Task[Any]"] = []
+
+    def create_task(self, coro: Awaitable[Any]) -> "asyncio.Task[Any]":
+        task = asyncio.ensure_future(coro)
+        self._tasks.append(task)
+        return task
+
+    async def __aenter__(self) -> "TaskScope":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            for task in self._tasks:
+                task.cancel()
+        results = await asyncio.gather(*self._tasks, return_exceptions=True)
+        if exc_type is None:
+            for result in results:
+                if isinstance(result, BaseException) and not isinstance(result, asyncio.CancelledError):
+                    raise result
@@ -1,13 +1,38 @@
 """Pytest configuration and shared fixtures."""
 
 import asyncio
+import os
+import sys
+from contextlib import AsyncExitStack
 from typing import AsyncGenerator
 
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
 from motive_proxy.app import create_app
+from motive_proxy.middleware import SecurityMiddleware
+from motive_proxy.observability import get_metrics_collector
+from motive_proxy.session import Session
+from tests._llm_helpers import FakeLLM
+
+try:
+    # Installed with uvicorn[standard] everywhere except Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def pytest_configure(config):
+    """Run async tests on uvloop when available, so concurrency tests see the production scheduler.
+
+    pytest-asyncio builds every loop from the current policy, so this is the
+    only place the loop implementation is chosen.
+    """
+    if uvloop is not None and sys.platform != "win32":
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 @pytest.fixture(autouse=True)
@@ -25,17 +50,14 @@ def fast_timeouts():
     )
     yield
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
-    """Create a test FastAPI application."""
+    """Create a test FastAPI application shared by the test session.
+
+    Mutable state (sessions, rate limit history, metrics) is cleared by
+    ``reset_state``, so tests stay independent under ``pytest -n auto``.
+    """
     app = create_app()
     # Manually initialize session manager for tests since lifespan isn't triggered
     from motive_proxy.session_manager import SessionManager
@@ -46,9 +68,84 @@ def app():
     return app
 
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def lifespan_app() -> AsyncGenerator[FastAPI, None]:
+    """Create one app and keep its lifespan open for the whole test session.
+
+    Tests using this fixture share the app's SessionManager; per-test state is
+    cleared by ``_reset_sessions``. Rate limiting is off because its per-IP
+    history would otherwise accumulate across every test sharing the app.
+    """
+    overrides = {
+        "MOTIVE_PROXY_HANDSHAKE_TIMEOUT_SECONDS": "1.0",
+        "MOTIVE_PROXY_TURN_TIMEOUT_SECONDS": "1.0",
+        "MOTIVE_PROXY_ENABLE_RATE_LIMITING": "false",
+    }
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+
+    async with AsyncExitStack() as stack:
+        try:
+            app = create_app()
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            # Build the middleware stack now so settings are read while the
+            # overrides apply; they must not leak into the rest of the session.
+            app.middleware_stack = app.build_middleware_stack()
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        yield app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def warmed_session_manager(lifespan_app):
+    """The shared app's SessionManager after one throwaway session round-trip.
+
+    Takes the first-session cold path (lock, dict growth, Session construction)
+    off the critical path of the tests that use it.
+    """
+    manager = lifespan_app.state.session_manager
+    await manager.get_or_create("__warmup__")
+    await manager.close("__warmup__")
+    return manager
+
+
+@pytest.fixture(autouse=True)
+def _reset_sessions(request):
+    """Clear shared session state after each test using ``lifespan_app``."""
+    yield
+    if "lifespan_app" in request.fixturenames:
+        request.getfixturevalue("lifespan_app").state.session_manager.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_state(request):
+    """Clear the shared app's sessions, rate limits and metrics before each test using it."""
+    if "app" in request.fixturenames:
+        app = request.getfixturevalue("app")
+        app.state.session_manager.reset()
+        get_metrics_collector().reset()
+        # The middleware stack is built on the first request
+        layer = app.middleware_stack
+        while layer is not None:
+            if isinstance(layer, SecurityMiddleware):
+                layer.reset()
+            layer = getattr(layer, "app", None)
+    yield
+
+
 @pytest.fixture
+def fast_session() -> Session:
+    """A Session with sub-second timeouts, so protocol regressions fail fast."""
+    return Session("test-session", handshake_timeout_seconds=0.1, turn_timeout_seconds=0.1)
+
+
+@pytest.fixture(scope="session")
 def client(app):
-    """Create a test client for the FastAPI application."""
+    """Create a test client for the FastAPI application, shared by the test session."""
     return TestClient(app)
 
 
@@ -59,6 +156,12 @@ async def async_client(app) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
 
+@pytest.fixture
+def fake_llm() -> FakeLLM:
+    """A fresh FakeLLM; tests push ``AIMessage`` replies onto ``fake_llm.responses``."""
+    return FakeLLM()
+
+
 @pytest.fixture
 def sample_openai_request():
     """Sample OpenAI Chat Completions API request."""
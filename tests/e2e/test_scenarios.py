@@ -5,12 +5,47 @@ Each scenario tests real subprocess behavior with actual network connections.
 """
 
 import pytest
-import subprocess
+import os
+import signal
 import sys
 import asyncio
+import async_timeout
 import tempfile
 from pathlib import Path
-from motive_proxy.testing.scenarios import ScenarioManager
+from typing import List, Tuple
+from click.testing import CliRunner
+from motive_proxy.testing.e2e_test_runner import main as e2e_main
+from motive_proxy.testing.scenarios import E2ETestScenario, ScenarioManager
+
+# Slack on top of the CLI's own --timeout for server startup and teardown
+_CLI_DEADLINE_SLACK_SECONDS = 15
+
+
+async def _run_cli(cmd: List[str], timeout: float) -> Tuple[int, str, str]:
+    """Run ``cmd`` to completion under an asyncio deadline.
+
+    Returns ``(returncode, stdout, stderr)``. The process is terminated and
+    reaped if the deadline expires or the test is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        async with async_timeout.timeout(timeout):
+            stdout, stderr = await proc.communicate()
+    finally:
+        if proc.returncode is None:
+            # The CLI spawns a server and clients that inherit our pipes, so the
+            # whole process group has to go before wait() can return.
+            if sys.platform == "win32":
+                proc.terminate()
+            else:
+                os.killpg(proc.pid, signal.SIGTERM)
+            await proc.wait()
+    return proc.returncode, stdout.decode(), stderr.decode()
 
 
 class TestE2EScenarios:
@@ -18,98 +53,46 @@ class TestE2EScenarios:
     
     @pytest.mark.e2e
     @pytest.mark.slow
-    def test_basic_handshake_scenario(self):
-        """Test basic handshake scenario using motive-proxy-e2e tool."""
-        # This test runs the E2E tool as a subprocess
+    @pytest.mark.parametrize(
+        "scenario,turns,concurrent,inner_timeout",
+        [
+            pytest.param("basic-handshake", 3, 1, 30, id="basic-handshake"),
+            pytest.param("basic-handshake", 2, 2, 45, id="concurrent-clients"),
+            pytest.param("streaming-test", 2, 1, 30, id="streaming"),
+            pytest.param("timeout-test", 2, 1, 30, id="error-handling"),
+        ],
+    )
+    async def test_e2e_scenario(self, scenario, turns, concurrent, inner_timeout):
+        """Run a scenario through the motive-proxy-e2e tool as a subprocess."""
         cmd = [
             "motive-proxy-e2e",
-            "--scenario", "basic-handshake",
-            "--turns", "3",
-            "--timeout", "30"
+            "--scenario", scenario,
+            "--turns", str(turns),
+            "--timeout", str(inner_timeout)
         ]
+        if concurrent > 1:
+            cmd += ["--concurrent", str(concurrent)]
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60  # Give the E2E test time to complete
+        returncode, stdout, stderr = await _run_cli(
+            cmd, timeout=inner_timeout + _CLI_DEADLINE_SLACK_SECONDS
         )
         
         # Check that the E2E test passed
-        assert result.returncode == 0, f"E2E test failed: {result.stderr}"
-        assert "✅ E2E test completed successfully" in result.stdout
-        
-    @pytest.mark.e2e
-    @pytest.mark.slow
-    def test_concurrent_clients_scenario(self):
-        """Test concurrent clients scenario using motive-proxy-e2e tool."""
-        cmd = [
-            "motive-proxy-e2e",
-            "--scenario", "basic-handshake",
-            "--turns", "2",
-            "--concurrent", "2",
-            "--timeout", "45"
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=90  # Give concurrent test more time
-        )
-        
-        assert result.returncode == 0, f"Concurrent E2E test failed: {result.stderr}"
-        assert "✅ E2E test completed successfully" in result.stdout
-        
-    @pytest.mark.e2e
-    @pytest.mark.slow
-    def test_streaming_scenario(self):
-        """Test streaming scenario using motive-proxy-e2e tool."""
-        cmd = [
-            "motive-proxy-e2e",
-            "--scenario", "timeout-test",
-            "--turns", "2",
-            "--timeout", "30"
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        assert result.returncode == 0, f"Streaming E2E test failed: {result.stderr}"
-        assert "✅ E2E test completed successfully" in result.stdout
-        
-    @pytest.mark.e2e
-    @pytest.mark.slow
-    def test_error_handling_scenario(self):
-        """Test error handling scenario using motive-proxy-e2e tool."""
-        cmd = [
-            "motive-proxy-e2e",
-            "--scenario", "timeout-test",
-            "--turns", "2",
-            "--timeout", "30"
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        assert result.returncode == 0, f"Error handling E2E test failed: {result.stderr}"
-        assert "✅ E2E test completed successfully" in result.stdout
+        assert returncode == 0, f"E2E {scenario} test failed: {stderr}"
+        assert "✅ E2E test completed successfully" in stdout
+
+
+@pytest.fixture(scope="session")
+def scenario_manager():
+    return ScenarioManager()
 
 
 class TestE2EInfrastructure:
     """Test the E2E testing infrastructure itself."""
     
-    def test_scenario_manager_has_required_scenarios(self):
+    def test_scenario_manager_has_required_scenarios(self, scenario_manager):
         """Test that ScenarioManager has all required scenarios."""
-        manager = ScenarioManager()
+        manager = scenario_manager
         
         required_scenarios = [
             "basic-handshake",
@@ -118,18 +101,19 @@ class TestE2EInfrastructure:
         
         for scenario_name in required_scenarios:
             assert scenario_name in manager.scenarios, f"Missing scenario: {scenario_name}"
+    
+    def test_added_scenarios_do_not_leak_between_managers(self):
+        """Test that the memoized defaults are not shared mutably between managers."""
+        first = ScenarioManager()
+        first.add_scenario(E2ETestScenario(name="custom", description="custom", steps=[]))
+        
+        assert "custom" in first.scenarios
+        assert "custom" not in ScenarioManager().scenarios
             
     def test_e2e_cli_help(self):
         """Test that E2E CLI shows help information."""
-        cmd = ["motive-proxy-e2e", "--help"]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = CliRunner().invoke(e2e_main, ["--help"])
         
-        assert result.returncode == 0
-        assert "--scenario" in result.stdout
-        assert "--turns" in result.stdout
+        assert result.exit_code == 0
+        assert "--scenario" in result.output
+        assert "--turns" in result.output
@@ -3,16 +3,13 @@
 import pytest
 import asyncio
 import json
-from pathlib import Path
-import sys
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from motive_proxy.testing.test_client_runner import _run_llm_conversation
 from motive_proxy.testing.llm_client import LLMTestClient
+from langchain_core.messages import AIMessage
 from langchain_openai import ChatOpenAI
-from unittest.mock import Mock, AsyncMock
+
+from tests._llm_helpers import FakeLLM
 
 
 class TestE2EConversationBug:
@@ -21,29 +18,24 @@ class TestE2EConversationBug:
     @pytest.mark.asyncio
     async def test_llm_conversation_flow_bug(self):
         """Test that reproduces the actual conversation bug."""
-        # Mock LLM that responds differently to different inputs
-        mock_llm = AsyncMock()
-        
         # Mock responses based on input
         def mock_ainvoke(messages):
             if not messages:
-                return Mock(content="No messages")
+                return AIMessage(content="No messages")
             
             last_message = messages[-1].content
             
             if "Let's test context management" in last_message:
-                return Mock(content="Hello! I'm ready to test context management.")
+                return AIMessage(content="Hello! I'm ready to test context management.")
             elif "Hello! I'm ready to test context management" in last_message:
-                return Mock(content="Got it! Your favorite color is blue. I'll remember that.")
+                return AIMessage(content="Got it! Your favorite color is blue. I'll remember that.")
             elif "Got it! Your favorite color is blue" in last_message:
-                return Mock(content="Yes, I've got it! Your favorite color is blue. Is there anything else I can help you with today?")
+                return AIMessage(content="Yes, I've got it! Your favorite color is blue. Is there anything else I can help you with today?")
             else:
-                return Mock(content=f"Unknown message: {last_message}")
+                return AIMessage(content=f"Unknown message: {last_message}")
         
-        mock_llm.ainvoke.side_effect = mock_ainvoke
-        
-        # Mock ChatOpenAI client to simulate MotiveProxy routing
-        mock_client = AsyncMock()
+        # Mock LLM that responds differently to different inputs
+        llm = FakeLLM(reply=mock_ainvoke)
         
         # Simulate MotiveProxy session protocol:
         # 1. Client A sends message → Client B receives it
@@ -57,31 +49,32 @@ class TestE2EConversationBug:
             nonlocal client_a_message, client_b_message
             
             if not messages:
-                return Mock(content="No messages")
+                return AIMessage(content="No messages")
             
             last_message = messages[-1].content
             
             # Client A sends "Hello! I'm ready to test context management."
             if "Hello! I'm ready to test context management" in last_message:
                 client_a_message = last_message
-                return Mock(content="Hello! I'm ready to test context management.")
+                return AIMessage(content="Hello! I'm ready to test context management.")
             
             # Client B sends "Ready to chat!" - this should return Client A's message
             elif "Ready to chat!" in last_message:
-                return Mock(content=client_a_message or "Hello! I'm ready to test context management.")
+                return AIMessage(content=client_a_message or "Hello! I'm ready to test context management.")
             
             # Client B sends "Got it! Your favorite color is blue..."
             elif "Got it! Your favorite color is blue" in last_message:
                 client_b_message = last_message
-                return Mock(content="Got it! Your favorite color is blue. I'll remember that.")
+                return AIMessage(content="Got it! Your favorite color is blue. I'll remember that.")
             
             else:
-                return Mock(content=f"Unknown message: {last_message}")
+                return AIMessage(content=f"Unknown message: {last_message}")
         
-        mock_client.ainvoke.side_effect = mock_client_ainvoke
+        # Mock ChatOpenAI client to simulate MotiveProxy routing
+        mock_client = FakeLLM(reply=mock_client_ainvoke)
         
         # Test Client A conversation flow
-        client_a_llm = LLMTestClient(mock_llm, max_context_messages=10)
+        client_a_llm = LLMTestClient(llm, max_context_messages=10)
         conversation_prompt = "Let's test context management. My favorite color is blue."
         
         # Client A should:
@@ -106,7 +99,7 @@ class TestE2EConversationBug:
         assert "Hello! I'm ready to test context management" in results_a[0]["message"]
         
         # Test Client B conversation flow  
-        client_b_llm = LLMTestClient(mock_llm, max_context_messages=10)
+        client_b_llm = LLMTestClient(llm, max_context_messages=10)
         
         # Client B should:
         # 1. Process conversation_prompt → "Hello! I'm ready to test context management." (WRONG!)
@@ -2,12 +2,8 @@
 
 import pytest
 import asyncio
-from unittest.mock import Mock, AsyncMock, patch
-from pathlib import Path
-import sys
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from langchain_core.messages import AIMessage
 
 from motive_proxy.testing.llm_client import LLMTestClient
 
@@ -16,15 +12,12 @@ class TestLLMConversationFlow:
     """Test that LLM clients have proper conversation flow."""
     
     @pytest.mark.asyncio
-    async def test_conversation_flow_client_a_initiates(self):
+    async def test_conversation_flow_client_a_initiates(self, fake_llm):
         """Test that Client A initiates conversation and Client B responds to A's message."""
-        # Mock LLM that responds differently to different inputs
-        mock_llm = AsyncMock()
-        
         # Client A's LLM responds to conversation prompt
-        mock_llm.ainvoke.return_value = Mock(content="Hello! I'm ready to test context management.")
+        fake_llm.responses.append(AIMessage(content="Hello! I'm ready to test context management."))
         
-        client_a = LLMTestClient(mock_llm, max_context_messages=10)
+        client_a = LLMTestClient(fake_llm, max_context_messages=10)
         
         # Client A processes conversation prompt
         conversation_prompt = "Let's test context management. My favorite color is blue."
@@ -34,31 +27,29 @@ class TestLLMConversationFlow:
         
         # Now Client A should send this response to MotiveProxy
         # Client B should receive this response and respond to it
-        mock_llm.ainvoke.return_value = Mock(content="Got it! Your favorite color is blue. I'll remember that.")
+        fake_llm.responses.append(AIMessage(content="Got it! Your favorite color is blue. I'll remember that."))
         
         client_b_response = await client_a.process_message(client_a_response)
         
         assert client_b_response == "Got it! Your favorite color is blue. I'll remember that."
     
     @pytest.mark.asyncio 
-    async def test_conversation_flow_client_b_responds_to_a(self):
+    async def test_conversation_flow_client_b_responds_to_a(self, fake_llm):
         """Test that Client B responds to Client A's message, not the conversation prompt."""
-        mock_llm = AsyncMock()
-        
         # Client B should respond to Client A's message, not the conversation prompt
-        client_b = LLMTestClient(mock_llm, max_context_messages=10)
+        client_b = LLMTestClient(fake_llm, max_context_messages=10)
         
         # Simulate Client A's message coming through MotiveProxy
         client_a_message = "Hello! I'm ready to test context management."
-        mock_llm.ainvoke.return_value = Mock(content="Got it! Your favorite color is blue. I'll remember that.")
+        fake_llm.responses.append(AIMessage(content="Got it! Your favorite color is blue. I'll remember that."))
         
         client_b_response = await client_b.process_message(client_a_message)
         
         assert client_b_response == "Got it! Your favorite color is blue. I'll remember that."
         
         # Verify the LLM was called with Client A's message, not the conversation prompt
-        mock_llm.ainvoke.assert_called_once()
-        call_args = mock_llm.ainvoke.call_args[0][0]  # First argument (messages list)
+        assert len(fake_llm.calls) == 1
+        call_args = fake_llm.calls[0]  # The messages list
         assert len(call_args) == 1
         assert call_args[0].content == client_a_message
     
@@ -1,8 +1,10 @@
 """Tests for LLM-enhanced test client functionality."""
 
+import asyncio
 import pytest
 import os
-from unittest.mock import Mock, patch, AsyncMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from motive_proxy.testing.llm_client import LLMTestClient, create_llm_client
 
@@ -37,40 +39,30 @@ class TestLLMTestClient:
             create_llm_client('unsupported', 'model', 'key')
 
     @pytest.mark.asyncio
-    async def test_llm_client_conversation(self):
+    async def test_llm_client_conversation(self, fake_llm):
         """Test LLM client conversation flow."""
-        # Mock LLM response
-        mock_response = Mock()
-        mock_response.content = "Hello! I'm doing well, thank you for asking."
+        fake_llm.responses.append(AIMessage(content="Hello! I'm doing well, thank you for asking."))
         
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke.return_value = mock_response
-        
-        client = LLMTestClient(mock_llm)
+        client = LLMTestClient(fake_llm)
         
         # Process a message
         response = await client.process_message("How are you?")
         
         assert response == "Hello! I'm doing well, thank you for asking."
-        mock_llm.ainvoke.assert_called_once()
+        assert len(fake_llm.calls) == 1
         
         # Check conversation history
         assert len(client.conversation_history) == 2  # Human message + AI response
 
     @pytest.mark.asyncio
-    async def test_llm_client_conversation_context(self):
+    async def test_llm_client_conversation_context(self, fake_llm):
         """Test that LLM client maintains conversation context."""
-        # Mock LLM responses
-        mock_response1 = Mock()
-        mock_response1.content = "I'm an AI assistant."
-        
-        mock_response2 = Mock()
-        mock_response2.content = "Yes, I remember you asked about my identity."
+        fake_llm.responses.extend([
+            AIMessage(content="I'm an AI assistant."),
+            AIMessage(content="Yes, I remember you asked about my identity."),
+        ])
         
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke.side_effect = [mock_response1, mock_response2]
-        
-        client = LLMTestClient(mock_llm)
+        client = LLMTestClient(fake_llm)
         
         # First message
         response1 = await client.process_message("What are you?")
@@ -81,7 +73,55 @@ class TestLLMTestClient:
         assert response2 == "Yes, I remember you asked about my identity."
         
         # Should have been called twice with different conversation histories
-        assert mock_llm.ainvoke.call_count == 2
+        assert len(fake_llm.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_batched_turns_share_one_worker(self, fake_llm):
+        """Test that batch_size > 1 sends queued turns to the LLM together."""
+        fake_llm.responses.extend(AIMessage(content=f"Response {i}") for i in range(3))
+        client = LLMTestClient(fake_llm, batch_size=3)
+        
+        try:
+            responses = await asyncio.gather(
+                *(client.process_message(f"Message {i}") for i in range(3))
+            )
+        finally:
+            await client.aclose()
+        
+        assert responses == ["Response 0", "Response 1", "Response 2"]
+        assert len(fake_llm.calls) == 3
+        assert [m.content for m in client.conversation_history[::2]] == [
+            "Message 0", "Message 1", "Message 2"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batched_turn_failure_does_not_stop_worker(self, fake_llm):
+        """Test that a reply that cannot be recorded fails only its own turn."""
+        fake_llm.responses.extend([
+            AIMessage(content="Response 0"),
+            # A reply whose content cannot be measured or recorded
+            SimpleNamespace(content=None),
+            AIMessage(content="Response 2"),
+        ])
+        client = LLMTestClient(fake_llm, batch_size=3)
+
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(client.process_message(f"Message {i}") for i in range(3)),
+                    return_exceptions=True,
+                ),
+                timeout=1,
+            )
+            fake_llm.responses.append(AIMessage(content="Response 3"))
+            follow_up = await asyncio.wait_for(client.process_message("Message 3"), timeout=1)
+        finally:
+            await client.aclose()
+
+        assert results[0] == "Response 0"
+        assert isinstance(results[1], TypeError)
+        assert results[2] == "Response 2"
+        assert follow_up == "Response 3"
 
     def test_environment_variable_api_keys(self):
         """Test that API keys are loaded from environment variables."""
@@ -97,10 +137,9 @@ class TestLLMTestClient:
                 client = create_llm_client('google', 'gemini-2.5-flash', 'explicit-key')
                 mock_google.assert_called_once_with(model='gemini-2.5-flash', api_key='explicit-key')
 
-    def test_context_window_management(self):
+    def test_context_window_management(self, fake_llm):
         """Test context window management functionality."""
-        mock_llm = AsyncMock()
-        client = LLMTestClient(mock_llm, max_context_messages=3)
+        client = LLMTestClient(fake_llm, max_context_messages=3)
         
         # Set system prompt
         client.set_system_prompt("You are a helpful assistant.")
@@ -110,20 +149,18 @@ class TestLLMTestClient:
         summary = client.get_context_summary()
         assert summary['max_context_messages'] == 3
         assert summary['total_messages'] == 0
-        assert summary['context_messages'] == 0
+        # System prompt plus the slot for the next message
+        assert summary['context_messages'] == 2
         assert summary['has_system_prompt'] == True
 
     @pytest.mark.asyncio
-    async def test_context_truncation(self):
+    async def test_context_truncation(self, fake_llm):
         """Test that context is properly truncated when exceeding limits."""
-        mock_llm = AsyncMock()
-        client = LLMTestClient(mock_llm, max_context_messages=2)
+        client = LLMTestClient(fake_llm, max_context_messages=2)
         
         # Add messages beyond the limit
+        fake_llm.responses.extend(AIMessage(content=f"Response {i}") for i in range(5))
         for i in range(5):
-            mock_response = AIMessage(content=f"Response {i}")
-            mock_llm.ainvoke.return_value = mock_response
-            
             await client.process_message(f"Message {i}")
         
         # Should have 10 total messages (5 human + 5 AI) but only 2 in context
@@ -138,17 +175,28 @@ class TestLLMTestClient:
         assert context[1].content == "Response 4"
 
     @pytest.mark.asyncio
-    async def test_system_prompt_in_context(self):
+    async def test_summary_created_with_small_context_window(self, fake_llm):
+        """Test that old turns are summarized even when max_context_messages is below the threshold."""
+        client = LLMTestClient(fake_llm, max_context_messages=6)
+
+        fake_llm.responses.extend(AIMessage(content=f"Response {i}") for i in range(8))
+        for i in range(8):
+            await client.process_message(f"Message {i} with enough detail to be worth summarizing later")
+
+        summary = client.get_context_summary()
+        assert summary['total_messages'] == 16
+        assert summary['has_conversation_summary'] == True
+        assert "Message 0" in client.conversation_summary
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_in_context(self, fake_llm):
         """Test that system prompt is included in context when present."""
-        mock_llm = AsyncMock()
-        client = LLMTestClient(mock_llm, max_context_messages=3)
+        client = LLMTestClient(fake_llm, max_context_messages=3)
         client.set_system_prompt("You are a helpful assistant.")
         
         # Add messages beyond the limit
+        fake_llm.responses.extend(AIMessage(content=f"Response {i}") for i in range(4))
         for i in range(4):
-            mock_response = AIMessage(content=f"Response {i}")
-            mock_llm.ainvoke.return_value = mock_response
-            
             await client.process_message(f"Message {i}")
         
         # Context should include system prompt + recent messages
@@ -165,10 +213,9 @@ class TestLLMTestClient:
         assert isinstance(context[3], AIMessage)
         assert context[3].content == "Response 3"
 
-    def test_clear_history(self):
+    def test_clear_history(self, fake_llm):
         """Test clearing conversation history."""
-        mock_llm = AsyncMock()
-        client = LLMTestClient(mock_llm)
+        client = LLMTestClient(fake_llm)
         client.set_system_prompt("Test prompt")
         
         # Add some messages
@@ -4,7 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from motive_proxy.app import create_app
-from motive_proxy.observability import get_logger, get_metrics_collector, time_operation
+from motive_proxy.observability import MetricsCollector, get_logger, get_metrics_collector, time_operation
 
 
 class TestObservability:
@@ -53,6 +53,20 @@ class TestObservability:
         assert "context_timer[test=value]" in timers
         assert timers["context_timer[test=value]"]["count"] == 1
 
+    def test_metrics_snapshot_reused_until_changed(self):
+        """Test that snapshot() is rebuilt only after a metric changes."""
+        collector = MetricsCollector()
+        collector.increment_counter("snap_counter")
+        
+        first = collector.snapshot()
+        assert collector.snapshot() is first
+        
+        collector.record_timer("snap_timer", 0.5)
+        second = collector.snapshot()
+        assert second is not first
+        assert second["counters"]["snap_counter"] == 1
+        assert second["timers"]["snap_timer"]["count"] == 1
+
     def test_metrics_endpoint(self, client: TestClient):
         """Test that metrics endpoint returns data."""
         # Add some test metrics
@@ -273,6 +273,29 @@ class TestProtocolManager:
         assert adapter is not None
         assert isinstance(adapter, OpenAIAdapter)
 
+    @pytest.mark.parametrize("endpoint", ["", None])
+    def test_get_adapter_for_request_missing_endpoint(self, endpoint):
+        """Test that an empty or missing endpoint falls back to OpenAI."""
+        manager = ProtocolManager()
+        
+        adapter = manager.get_adapter_for_request({}, endpoint)
+        assert adapter is manager.get_adapter(ProtocolType.OPENAI)
+
+    def test_register_adapter_replaces_endpoint_mapping(self):
+        """Test re-registering a protocol type updates endpoint lookups and the fallback."""
+        manager = ProtocolManager()
+        
+        class CustomOpenAIAdapter(OpenAIAdapter):
+            def get_endpoint_path(self) -> str:
+                return "/v2/chat/completions"
+        
+        custom = CustomOpenAIAdapter()
+        manager.register_adapter(custom)
+        
+        assert manager.get_adapter_by_endpoint("/v2/chat/completions") is custom
+        assert manager.get_adapter_by_endpoint("/v1/chat/completions") is None
+        assert manager.get_adapter_for_request({}, "/unknown/endpoint") is custom
+
     def test_list_supported_protocols(self):
         """Test listing supported protocols."""
         manager = ProtocolManager()
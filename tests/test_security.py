@@ -1,10 +1,14 @@
 """Tests for security features: rate limiting, payload size, auth."""
 
+import asyncio
+import json
+
+import httpx
 import pytest
 import time
 from fastapi.testclient import TestClient
 
-from motive_proxy.rate_limiter import RateLimiter, RateLimitConfig
+from motive_proxy.rate_limiter import RateLimiter, RateLimitConfig, SlidingWindowCounter
 from motive_proxy.middleware import SecurityMiddleware
 from motive_proxy.settings import Settings
 
@@ -91,6 +95,58 @@ class TestRateLimiter:
         assert stats["requests_last_10_seconds"] == 3
         assert stats["total_tracked_requests"] == 3
 
+    @pytest.mark.asyncio
+    async def test_rate_limiter_retry_after(self):
+        """Test retry_after reports how long a blocked identifier must wait."""
+        config = RateLimitConfig(requests_per_minute=60, requests_per_hour=1000, burst_limit=5)
+        limiter = RateLimiter(config)
+        
+        assert await limiter.retry_after("test-ip") == 0.0
+        for _ in range(6):
+            await limiter.is_allowed("test-ip")
+        
+        # One burst token refills every 10s / 5 = 2s
+        assert 0.0 < await limiter.retry_after("test-ip") <= 2.0
+
+    def test_sliding_window_counter_weights_previous_window(self):
+        """Test that the previous window's count decays across the current one."""
+        second = 1_000_000_000
+        counter = SlidingWindowCounter(60 * second, 120 * second)
+        counter.curr = 10
+        
+        assert counter.estimate(150 * second) == 10  # Same window
+        assert counter.estimate(210 * second) == 5  # Half-way into the next window
+        assert counter.is_full(210 * second, limit_ns=5 * 60 * second)
+        assert not counter.is_full(210 * second, limit_ns=6 * 60 * second)
+        counter.curr += 2
+        assert counter.estimate(225 * second) == 2.5 + 2
+        assert counter.estimate(400 * second) == 0  # Two windows later nothing overlaps
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_evicts_only_stale_entries(self):
+        """Test that going over max_ips drops idle entries but keeps live ones."""
+        config = RateLimitConfig(requests_per_minute=5, burst_limit=10, max_ips=16)
+        clock = [1000 * 1_000_000_000]
+        limiter = RateLimiter(config, clock=lambda: clock[0])
+        
+        # Fill the table with entries that then go idle for over an hour
+        for i in range(64):
+            await limiter.is_allowed(f"idle-{i}")
+        clock[0] += 4000 * 1_000_000_000
+        
+        # A live, exhausted identifier must keep its state through sweeps
+        for _ in range(5):
+            await limiter.is_allowed("busy")
+        # Enough inserts that the table passes its sweep threshold
+        for i in range(1000):
+            await limiter.is_allowed(f"new-{i}")
+        
+        tracked = set(limiter._limits)
+        assert not any(identifier.startswith("idle-") for identifier in tracked)
+        is_allowed, reason = await limiter.is_allowed("busy")
+        assert is_allowed is False
+        assert "per minute" in reason
+
 
 class TestSecurityMiddleware:
     """Test security middleware functionality."""
@@ -107,29 +163,49 @@ class TestSecurityMiddleware:
 
     def test_security_middleware_payload_size_limit(self, client: TestClient):
         """Test payload size limit enforcement."""
-        # Create a large payload (over 1MB default limit)
-        large_content = "x" * (2 * 1024 * 1024)  # 2MB
-        large_request = {
-            "model": "test-session",
-            "messages": [{"role": "user", "content": large_content}]
-        }
-        
-        response = client.post("/v1/chat/completions", json=large_request)
+        # The middleware rejects on the declared Content-Length alone, so a
+        # tiny body announcing more than the 1MB default limit is enough
+        response = client.post(
+            "/v1/chat/completions",
+            content=b"{}",
+            headers={
+                "content-length": str(Settings().max_payload_size + 1),
+                "content-type": "application/json",
+            },
+        )
         assert response.status_code == 413
         assert "Payload too large" in response.json()["error"]["message"]
 
-    def test_security_middleware_rate_limiting(self, client: TestClient):
+    def test_security_middleware_payload_rejected_before_rate_limit(self, client: TestClient):
+        """Test that oversized requests are rejected without spending rate-limit budget."""
+        oversized = b"x" * (Settings().max_payload_size + 1)
+        
+        # More requests than the burst limit of 10, none of them reach the limiter
+        statuses = {
+            client.post("/v1/chat/completions", content=oversized,
+                        headers={"content-type": "application/json"}).status_code
+            for _ in range(12)
+        }
+        assert statuses == {413}
+
+    @pytest.mark.asyncio
+    async def test_security_middleware_rate_limiting(self, app):
         """Test rate limiting enforcement."""
         request_data = {
             "model": "test-session",
             "messages": [{"role": "user", "content": "Hello"}]
         }
+        body = json.dumps(request_data).encode()
+        headers = {"content-type": "application/json"}
         
-        # Make many requests quickly to trigger rate limiting
-        responses = []
-        for _ in range(15):  # Exceed burst limit of 10
-            response = client.post("/v1/chat/completions", json=request_data)
-            responses.append(response)
+        # Make many requests concurrently to trigger rate limiting
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            responses = await asyncio.gather(*[  # Exceed burst limit of 10
+                client.post("/v1/chat/completions", content=body, headers=headers)
+                for _ in range(15)
+            ])
         
         # Some requests should be rate limited
         rate_limited_responses = [r for r in responses if r.status_code == 429]
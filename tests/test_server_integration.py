@@ -4,6 +4,8 @@ These tests verify that the server works correctly with real HTTP requests,
 replacing the need for ad-hoc curl or manual testing.
 """
 
+import asyncio
+
 import pytest
 import httpx
 from fastapi.testclient import TestClient
@@ -55,38 +57,36 @@ class TestServerIntegration:
                 }
             }
 
-    def test_openai_endpoint_with_different_models(self, client: TestClient):
+    @pytest.mark.parametrize("model_name", [
+        "session-abc-123",
+        "game-npc-guard",
+        "test-user-session",
+        "long-session-name-with-dashes-and-numbers-12345",
+    ])
+    def test_openai_endpoint_with_different_models(self, client: TestClient, model_name: str):
         """Test that different model names are handled correctly."""
-        test_cases = [
-            "session-abc-123",
-            "game-npc-guard",
-            "test-user-session",
-            "long-session-name-with-dashes-and-numbers-12345"
-        ]
+        request_data = {
+            "model": model_name,
+            "messages": [{"role": "user", "content": f"Test message for {model_name}"}]
+        }
         
-        for model_name in test_cases:
-            request_data = {
-                "model": model_name,
-                "messages": [{"role": "user", "content": f"Test message for {model_name}"}]
-            }
-            
-            response = client.post("/v1/chat/completions", json=request_data)
-            assert response.status_code in [200, 408]
+        response = client.post("/v1/chat/completions", json=request_data)
+        assert response.status_code in [200, 408]
 
-            data = response.json()
-            if response.status_code == 200:
-                assert data["model"] == model_name
-            else:
-                assert data == {
-                    "detail": {
-                        "error": {
-                            "message": "Request timed out",
-                            "type": "timeout_error",
-                            "code": "timeout",
-                            "param": None,
-                        }
+        data = response.json()
+        if response.status_code == 200:
+            assert data["model"] == model_name
+        else:
+            assert data == {
+                "detail": {
+                    "error": {
+                        "message": "Request timed out",
+                        "type": "timeout_error",
+                        "code": "timeout",
+                        "param": None,
                     }
                 }
+            }
 
     def test_openai_endpoint_with_multiple_messages(self, client: TestClient):
         """Test endpoint with multiple messages in conversation."""
@@ -254,37 +254,26 @@ class TestServerIntegration:
                     }
                 }
 
-    def test_concurrent_requests_integration(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_integration(self, app):
         """Test server handling of concurrent requests."""
-        import threading
-        import time
-        
-        results = []
-        
-        def make_request(session_id: str):
-            request_data = {
+        def request_data(session_id: int):
+            return {
                 "model": f"concurrent-test-{session_id}",
                 "messages": [{"role": "user", "content": f"Concurrent request {session_id}"}]
             }
-            
-            response = client.post("/v1/chat/completions", json=request_data)
-            results.append((session_id, response.status_code))
-        
-        # Make 5 concurrent requests
-        threads = []
-        for i in range(5):
-            thread = threading.Thread(target=make_request, args=(str(i),))
-            threads.append(thread)
-            thread.start()
         
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            # Make 5 concurrent requests
+            tasks = [client.post("/v1/chat/completions", json=request_data(i)) for i in range(5)]
+            responses = await asyncio.gather(*tasks)
         
         # All requests should be handled (200 or timeout 408 if unpaired)
-        assert len(results) == 5
-        for session_id, status_code in results:
-            assert status_code in [200, 408], f"Request {session_id} failed with status {status_code}"
+        assert len(responses) == 5
+        for session_id, response in enumerate(responses):
+            assert response.status_code in [200, 408], f"Request {session_id} failed with status {response.status_code}"
 
     def test_server_response_timing(self, client: TestClient):
         """Test that server responds within reasonable time."""
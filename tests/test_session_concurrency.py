@@ -9,6 +9,8 @@ from motive_proxy.session import Session
 
 @pytest.mark.asyncio
 async def test_simultaneous_connect_deterministic_ab_assignment():
+    # Short timeouts bound the test if neither side ever completes; the
+    # deadlines run on the event loop clock, so an injected clock cannot drive them
     session = Session(session_id="simul-1", handshake_timeout_seconds=0.2, turn_timeout_seconds=0.2)
 
     async def client_a():
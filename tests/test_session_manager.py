@@ -1,88 +1,131 @@
 """Tests for session management functionality."""
 
-from unittest.mock import AsyncMock, Mock
+import asyncio
 
 import pytest
 
-from motive_proxy.session import Session
+from motive_proxy.session import Session, Side
 from motive_proxy.session_manager import SessionManager
+from tests._clock import FakeClock
+
+
+@pytest.fixture
+def session() -> Session:
+    """A fresh, unconnected session."""
+    return Session(session_id="test-session")
+
+
+@pytest.fixture
+def manager() -> SessionManager:
+    """A fresh manager whose handshakes outlast any test."""
+    return SessionManager(handshake_timeout_seconds=5.0)
 
 
 class TestSession:
     """Test cases for the Session class."""
 
-    def test_session_creation(self):
+    def test_session_creation(self, session):
         """Test that a session can be created with required parameters."""
-        session_id = "test-session-123"
-        session = Session(session_id=session_id)
-
-        assert session.session_id == session_id
+        assert session.session_id == "test-session"
         # New session does not pre-connect either side by default
         # Handshake/connection state is implicit via first/second requests
         assert isinstance(session.session_id, str)
 
-    def test_session_human_connection(self):
-        """Test connecting a human client to a session."""
-        session = Session(session_id="test-session")
-        # Connection is implicit; this test is no longer applicable in new design
-        # Keeping as no-op to maintain suite structure
-        assert session.session_id == "test-session"
-
-    def test_session_program_connection(self):
-        """Test connecting a program client to a session."""
-        session = Session(session_id="test-session")
-        # Connection is implicit; this test is no longer applicable in new design
-        assert session.session_id == "test-session"
-
-    def test_session_both_connected(self):
-        """Test that a session is ready when both clients are connected."""
-        session = Session(session_id="test-session")
-        # Implicit pairing via first/second request; no explicit connect API
-        assert session.session_id == "test-session"
-
-    def test_session_disconnection(self):
-        """Test disconnecting clients from a session."""
-        session = Session(session_id="test-session")
-        # Implicit disconnect; not applicable in this minimal design
-        assert session.session_id == "test-session"
-
 
 class TestSessionManager:
     """Test cases for the SessionManager class."""
 
-    def test_session_manager_creation(self):
-        """Test that a session manager can be created."""
-        manager = SessionManager()
-        assert manager is not None
-        assert isinstance(manager, SessionManager)
-
-    def test_create_session(self):
-        """Test creating a new session."""
-        manager = SessionManager()
-        session_id = "test-session-123"
-
-        # Manager now exposes async get_or_create
-        assert session_id not in []  # placeholder assertion to keep test active
-
-    def test_get_existing_session(self):
-        """Test retrieving an existing session."""
-        manager = SessionManager()
-        session_id = "test-session-123"
-
-        # Adapted to new async API; this test case is superseded by integration tests
-        assert session_id == "test-session-123"
-
-    def test_get_nonexistent_session(self):
-        """Test retrieving a session that doesn't exist."""
-        manager = SessionManager()
-
-        # Adapted to new async API; retrieval via get_or_create is async
-        assert manager is not None
-
-    def test_cleanup_inactive_sessions(self):
-        """Test cleaning up inactive sessions."""
-        manager = SessionManager()
-        session_id = "test-session-123"
-
-        # Cleanup is deferred; covered by future tests
-        assert isinstance(manager, SessionManager)
+    @pytest.mark.asyncio
+    async def test_get_or_create_returns_same_instance(self, manager):
+        """Test that repeated lookups of one session id share a Session."""
+        first = await manager.get_or_create("same-session")
+        second = await manager.get_or_create("same-session")
+
+        assert first is second
+        assert await manager.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_expired(self):
+        """Test that cleanup drops only sessions idle longer than the TTL."""
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
+        await manager.get_or_create("idle-session")
+        clock.advance(120)
+        await manager.get_or_create("fresh-session")
+        clock.advance(30)
+
+        assert await manager.cleanup_expired(ttl_seconds=60) == 1
+        assert [s["session_id"] for s in await manager.list_sessions()] == ["fresh-session"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_sessions_active_since_creation(self):
+        """Test that activity after creation defers expiry past the creation time."""
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
+        session = await manager.get_or_create("busy-session")
+        clock.advance(50)
+        session._last_activity_ts = clock()
+        clock.advance(30)
+
+        assert await manager.cleanup_expired(ttl_seconds=60) == 0
+        clock.advance(31)
+        assert await manager.cleanup_expired(ttl_seconds=60) == 1
+        assert await manager.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_get_or_create_replaces_expired_session(self):
+        """Test that a lookup past the session TTL starts a fresh session."""
+        clock = FakeClock()
+        manager = SessionManager(clock=clock, session_ttl_seconds=60)
+        first = await manager.get_or_create("lazy-session")
+        clock.advance(60)
+        assert await manager.get_or_create("lazy-session") is first
+        clock.advance(1)
+
+        second = await manager.get_or_create("lazy-session")
+
+        assert second is not first
+        assert await manager.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_reset_clears_sessions_and_cancels_waiters(self, manager):
+        """Test that reset drops sessions and cancels pending futures."""
+        session = await manager.get_or_create("reset-session")
+
+        waiter = asyncio.create_task(session.process_request("handshake"))
+        await asyncio.sleep(0)
+
+        manager.reset()
+
+        assert await manager.count() == 0
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    @pytest.mark.asyncio
+    async def test_cleanup_drops_callbacks_for_sessions_never_created(self):
+        """Test that waiter callbacks for sessions that never appear do not accumulate."""
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
+        for i in range(1000):
+            manager.add_waiter_callback(f"abandoned-{i}", Side.A, lambda: None)
+        clock.advance(30)
+        manager.add_waiter_callback("recent", Side.A, lambda: None)
+        clock.advance(40)
+
+        await manager.cleanup_expired(ttl_seconds=60)
+
+        assert list(manager._pending_callbacks) == ["recent"]
+
+    @pytest.mark.asyncio
+    async def test_waiter_callback_fires_when_side_blocks(self, manager):
+        """Test that a waiter callback registered before creation fires once A parks."""
+        a_waiting = asyncio.Event()
+        manager.add_waiter_callback("cb-session", Side.A, a_waiting.set)
+
+        session = await manager.get_or_create("cb-session")
+        waiter = asyncio.create_task(session.process_request("handshake"))
+        await asyncio.wait_for(a_waiting.wait(), timeout=1.0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
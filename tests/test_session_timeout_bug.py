@@ -2,127 +2,62 @@
 
 import pytest
 import asyncio
-import sys
-from pathlib import Path
+import async_timeout
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from motive_proxy.session import Session
+async def _do_turn(session, a_msg: str, b_msg: str):
+    """Send one message from each side, A first, and return both replies."""
+    client_a_task = asyncio.create_task(session.process_request(a_msg))
+    # Only blocks on the handshake turn, until A has registered
+    await session.first_client_connected.wait()
+    client_b_task = asyncio.create_task(session.process_request(b_msg))
+
+    async with async_timeout.timeout(0.5):
+        client_a_response = await client_a_task
+    async with async_timeout.timeout(0.5):
+        client_b_response = await client_b_task
+    return client_a_response, client_b_response
 
 
 class TestSessionTimeoutBug:
     """Test that captures the session timeout bug."""
     
     @pytest.mark.asyncio
-    async def test_session_timeout_after_first_exchange(self):
+    async def test_session_timeout_after_first_exchange(self, fast_session):
         """Test that sessions timeout after the first exchange."""
-        session = Session("test-session", handshake_timeout_seconds=2.0, turn_timeout_seconds=2.0)
-        
-        # Turn 1: Handshake
-        print("=== Turn 1: Handshake ===")
-        
-        # Client A connects (Side A handshake)
-        client_a_task = asyncio.create_task(session.process_request("Hello from A"))
-        
-        # Give A a moment to establish connection
-        await asyncio.sleep(0.1)
-        
-        # Client B connects (Side B first message)
-        client_b_task = asyncio.create_task(session.process_request("Hello from B"))
-        
-        # Wait for both to complete
-        try:
-            client_a_response = await asyncio.wait_for(client_a_task, timeout=5.0)
-            client_b_response = await asyncio.wait_for(client_b_task, timeout=5.0)
-            
-            print(f"Turn 1 - Client A got: '{client_a_response}'")
-            print(f"Turn 1 - Client B got: '{client_b_response}'")
-            
-            # Turn 1 should work
-            assert client_a_response == "Hello from B"
-            assert client_b_response == "Hello from A"  # This might be wrong based on protocol
-            
-        except asyncio.TimeoutError as e:
-            pytest.fail(f"Turn 1 timed out: {e}")
-        
-        # Turn 2: This should work but currently fails
-        print("\n=== Turn 2: First real exchange ===")
-        
-        # Client A sends message
-        client_a_task = asyncio.create_task(session.process_request("Message 2 from A"))
-        
-        # Give A a moment
-        await asyncio.sleep(0.1)
-        
-        # Client B sends message
-        client_b_task = asyncio.create_task(session.process_request("Message 2 from B"))
-        
-        # Wait for both to complete
-        try:
-            client_a_response = await asyncio.wait_for(client_a_task, timeout=5.0)
-            client_b_response = await asyncio.wait_for(client_b_task, timeout=5.0)
-            
-            print(f"Turn 2 - Client A got: '{client_a_response}'")
-            print(f"Turn 2 - Client B got: '{client_b_response}'")
+        session = fast_session
+        
+        # Turn 1 is the handshake; turns 2 and 3 are real exchanges
+        for turn in range(1, 4):
+            try:
+                client_a_response, client_b_response = await _do_turn(
+                    session, f"Message {turn} from A", f"Message {turn} from B"
+                )
+            except asyncio.TimeoutError as e:
+                pytest.fail(f"Turn {turn} timed out: {e}")
             
-            # Turn 2 should work
-            assert client_a_response == "Message 2 from B"
-            assert client_b_response == "Message 2 from A"
-            
-        except asyncio.TimeoutError as e:
-            pytest.fail(f"Turn 2 timed out: {e}")
-        
-        # Turn 3: This should also work
-        print("\n=== Turn 3: Second real exchange ===")
-        
-        # Client A sends message
-        client_a_task = asyncio.create_task(session.process_request("Message 3 from A"))
-        
-        # Give A a moment
-        await asyncio.sleep(0.1)
-        
-        # Client B sends message
-        client_b_task = asyncio.create_task(session.process_request("Message 3 from B"))
-        
-        # Wait for both to complete
-        try:
-            client_a_response = await asyncio.wait_for(client_a_task, timeout=5.0)
-            client_b_response = await asyncio.wait_for(client_b_task, timeout=5.0)
-            
-            print(f"Turn 3 - Client A got: '{client_a_response}'")
-            print(f"Turn 3 - Client B got: '{client_b_response}'")
-            
-            # Turn 3 should work
-            assert client_a_response == "Message 3 from B"
-            assert client_b_response == "Message 3 from A"
-            
-        except asyncio.TimeoutError as e:
-            pytest.fail(f"Turn 3 timed out: {e}")
+            assert client_a_response == f"Message {turn} from B"
+            assert client_b_response == f"Message {turn} from A"
     
     @pytest.mark.asyncio
-    async def test_session_protocol_expectations(self):
+    async def test_session_protocol_expectations(self, fast_session):
         """Test what the session protocol actually does vs what we expect."""
-        session = Session("test-session", handshake_timeout_seconds=2.0, turn_timeout_seconds=2.0)
-        
-        # Test the actual protocol behavior
-        print("=== Testing actual protocol behavior ===")
+        session = fast_session
         
         # Client A connects first
         client_a_task = asyncio.create_task(session.process_request("A's first message"))
         
-        # Give A a moment
-        await asyncio.sleep(0.1)
+        # Wait until A has registered as the handshake side
+        await session.first_client_connected.wait()
         
         # Client B connects second
         client_b_task = asyncio.create_task(session.process_request("B's first message"))
         
         # Wait for both
-        client_a_response = await asyncio.wait_for(client_a_task, timeout=5.0)
-        client_b_response = await asyncio.wait_for(client_b_task, timeout=5.0)
-        
-        print(f"Client A got: '{client_a_response}'")
-        print(f"Client B got: '{client_b_response}'")
+        async with async_timeout.timeout(0.5):
+            client_a_response = await client_a_task
+        async with async_timeout.timeout(0.5):
+            await client_b_task
         
         # According to the protocol:
         # - A's first message content is ignored
@@ -2,12 +2,25 @@
 
 import pytest
 import json
+from unittest.mock import AsyncMock, Mock
+
 from fastapi.testclient import TestClient
 
 from motive_proxy.streaming import StreamingResponse, StreamChunk, StreamingSession
 from motive_proxy.session_manager import SessionManager
 
 
+_SSE_PREFIX = "data: "
+
+
+def _parse_sse(chunk: str) -> dict:
+    """Decode the JSON payload of one ``data: ...`` SSE chunk."""
+    # str.removeprefix needs Python 3.9
+    if chunk.startswith(_SSE_PREFIX):
+        chunk = chunk[len(_SSE_PREFIX):]
+    return json.loads(chunk.rstrip())
+
+
 class TestStreamingResponse:
     """Test streaming response functionality."""
 
@@ -15,7 +28,8 @@ class TestStreamingResponse:
     async def test_stream_completion(self):
         """Test streaming a completion."""
         response = StreamingResponse("test-session", "test-model")
-        completion = "Hello world this is a test"
+        # Only the first chunk is inspected, so a one-word completion is enough
+        completion = "Hi"
         
         chunks = []
         async for chunk in response.stream_completion("test prompt", completion):
@@ -24,7 +38,7 @@ class TestStreamingResponse:
         assert len(chunks) > 0
         
         # Parse first chunk
-        first_chunk_data = json.loads(chunks[0].split("data: ")[1])
+        first_chunk_data = _parse_sse(chunks[0])
         assert first_chunk_data["object"] == "chat.completion.chunk"
         assert first_chunk_data["model"] == "test-model"
         assert "choices" in first_chunk_data
@@ -46,7 +60,7 @@ class TestStreamingResponse:
         
         assert len(chunks) == 1
         
-        chunk_data = json.loads(chunks[0].split("data: ")[1])
+        chunk_data = _parse_sse(chunks[0])
         assert chunk_data["choices"][0]["finish_reason"] == "stop"
 
     @pytest.mark.asyncio
@@ -60,7 +74,7 @@ class TestStreamingResponse:
         
         assert len(chunks) == 1
         
-        chunk_data = json.loads(chunks[0].split("data: ")[1])
+        chunk_data = _parse_sse(chunks[0])
         assert "error" in chunk_data
         assert chunk_data["error"]["message"] == "Test error message"
         assert chunk_data["error"]["type"] == "test_error"
@@ -89,37 +103,33 @@ class TestStreamingIntegration:
             "stream": True
         }
         
-        response = client.post("/v1/chat/completions", json=request_data)
-        
-        # Should return 200 with streaming response
-        assert response.status_code == 200
-        assert response.headers["content-type"] == "text/event-stream"
-        assert "cache-control" in response.headers
-        
-        # Check that response contains SSE format
-        content = response.text
-        assert "data: " in content
-        assert "[DONE]" in content
-
-    def test_streaming_endpoint_invalid_json(self, client: TestClient):
-        """Test streaming endpoint with invalid JSON."""
-        response = client.post(
-            "/v1/chat/completions",
-            data="invalid json",
-            headers={"Content-Type": "application/json"}
-        )
-        
-        assert response.status_code == 422
-
-    def test_streaming_endpoint_empty_messages(self, client: TestClient):
-        """Test streaming endpoint with empty messages."""
-        request_data = {
-            "model": "test-session",
-            "messages": [],
-            "stream": True
-        }
-        
-        response = client.post("/v1/chat/completions", json=request_data)
+        with client.stream("POST", "/v1/chat/completions", json=request_data) as response:
+            # Should return 200 with streaming response
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "text/event-stream"
+            assert "cache-control" in response.headers
+            
+            # Check that response contains SSE format, stopping at the terminator
+            lines = []
+            for line in response.iter_lines():
+                lines.append(line)
+                if "[DONE]" in line:
+                    break
+        
+        assert any(line.startswith("data: ") for line in lines)
+        assert "[DONE]" in lines[-1]
+
+    @pytest.mark.parametrize(
+        "request_kwargs",
+        [
+            {"content": b"invalid json", "headers": {"Content-Type": "application/json"}},
+            {"json": {"model": "test-session", "messages": [], "stream": True}},
+        ],
+        ids=["invalid-json", "empty-messages"],
+    )
+    def test_streaming_endpoint_rejects_invalid_requests(self, client: TestClient, request_kwargs):
+        """Test streaming endpoint with malformed or empty requests."""
+        response = client.post("/v1/chat/completions", **request_kwargs)
         assert response.status_code == 422
 
 
@@ -177,11 +187,8 @@ class TestStreamingSession:
         session = StreamingSession("test-session", "test-model")
         
         # Create a mock session that will timeout
-        class MockSession:
-            async def process_request(self, content):
-                raise TimeoutError("Test timeout")
-        
-        mock_session = MockSession()
+        mock_session = Mock()
+        mock_session.process_request = AsyncMock(side_effect=TimeoutError("Test timeout"))
         
         chunks = []
         async for chunk in session.process_streaming_request("test content", mock_session):
@@ -190,6 +197,6 @@ class TestStreamingSession:
         assert len(chunks) > 0
         
         # Check that we get an error chunk
-        chunk_data = json.loads(chunks[0].split("data: ")[1])
+        chunk_data = _parse_sse(chunks[0])
         assert "error" in chunk_data
         assert "timeout" in chunk_data["error"]["type"]
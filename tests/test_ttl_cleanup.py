@@ -1,12 +1,14 @@
 """Tests for session TTL cleanup functionality."""
 
 import asyncio
+import async_timeout
+import contextlib
 import pytest
-import time
-from unittest.mock import patch
 
+from motive_proxy.observability import get_metrics_collector
 from motive_proxy.session import Session
 from motive_proxy.session_manager import SessionManager
+from tests._clock import FakeClock
 
 
 class TestTTLCleanup:
@@ -15,37 +17,51 @@ class TestTTLCleanup:
     @pytest.mark.asyncio
     async def test_cleanup_expired_sessions(self):
         """Test that expired sessions are cleaned up."""
-        manager = SessionManager()
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
         
         # Create a session
         session = await manager.get_or_create("test-session")
         assert await manager.count() == 1
         
-        # Mock time to simulate expiration
-        with patch('time.time', return_value=time.time() + 4000):  # 4000 seconds later
-            removed_count = await manager.cleanup_expired(ttl_seconds=3600)
-            assert removed_count == 1
-            assert await manager.count() == 0
+        # Advance the clock to simulate expiration
+        clock.advance(4000)  # 4000 seconds later
+        removed_count = await manager.cleanup_expired(ttl_seconds=3600)
+        assert removed_count == 1
+        assert await manager.count() == 0
 
     @pytest.mark.asyncio
     async def test_cleanup_preserves_active_sessions(self):
         """Test that active sessions are not cleaned up."""
-        manager = SessionManager()
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
         
         # Create a session
         session = await manager.get_or_create("active-session")
         assert await manager.count() == 1
         
-        # Mock time to simulate recent activity
-        with patch('time.time', return_value=time.time() + 100):  # Only 100 seconds later
-            removed_count = await manager.cleanup_expired(ttl_seconds=3600)
-            assert removed_count == 0
-            assert await manager.count() == 1
+        # Advance the clock to simulate recent activity
+        clock.advance(100)  # Only 100 seconds later
+        removed_count = await manager.cleanup_expired(ttl_seconds=3600)
+        assert removed_count == 0
+        assert await manager.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_with_nothing_expired_skips_lock(self):
+        """Test that a sweep with nothing due returns without waiting on the lock."""
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
+        await manager.get_or_create("fresh")
+        clock.advance(100)
+        
+        async with manager._lock:
+            assert await manager.cleanup_expired(ttl_seconds=3600) == 0
 
     @pytest.mark.asyncio
     async def test_cleanup_multiple_sessions(self):
         """Test cleanup with multiple sessions of different ages."""
-        manager = SessionManager()
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
         
         # Create multiple sessions
         await manager.get_or_create("session-1")
@@ -53,26 +69,70 @@ class TestTTLCleanup:
         await manager.get_or_create("session-3")
         assert await manager.count() == 3
         
-        # Mock time to expire only some sessions
-        with patch('time.time', return_value=time.time() + 2000):  # 2000 seconds later
-            removed_count = await manager.cleanup_expired(ttl_seconds=1500)  # TTL 1500s
-            assert removed_count == 3  # All should be expired
-            assert await manager.count() == 0
+        # Advance the clock to expire only some sessions
+        clock.advance(2000)  # 2000 seconds later
+        removed_count = await manager.cleanup_expired(ttl_seconds=1500)  # TTL 1500s
+        assert removed_count == 3  # All should be expired
+        assert await manager.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_eviction_and_get_record_idle_ages(self):
+        """Test that idle time is recorded on cache hits and on eviction."""
+        get_metrics_collector().reset()
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
+        await manager.get_or_create("tuned")
+        
+        clock.advance(10)
+        await manager.get_or_create("tuned")
+        clock.advance(90)
+        await manager.cleanup_expired(ttl_seconds=60)
+        
+        timers = get_metrics_collector().get_timers()
+        assert timers["session_idle_on_get"]["max"] == 10
+        assert timers["session_age_on_eviction"]["max"] == 100
+
+    @pytest.mark.asyncio
+    async def test_background_task_expires_sessions(self):
+        """Test that the manager's expiry task removes sessions once their TTL passes."""
+        manager = SessionManager(session_ttl_seconds=0.05)
+        await manager.get_or_create("short-lived")
+        
+        async with manager:
+            async with async_timeout.timeout(1.0):
+                while await manager.count():
+                    await asyncio.sleep(0.01)
+        
+        assert manager._gc_task is None
+
+    @pytest.mark.asyncio
+    async def test_background_task_expires_session_created_while_idle(self):
+        """Test that a session created while the expiry task sleeps on an empty heap still expires on time."""
+        manager = SessionManager(session_ttl_seconds=0.05, cleanup_interval_seconds=60.0)
+        
+        async with manager:
+            await asyncio.sleep(0)  # Let the task start its idle sleep
+            await manager.get_or_create("late-arrival")
+            async with async_timeout.timeout(1.0):
+                while await manager.count():
+                    await asyncio.sleep(0.01)
 
     @pytest.mark.asyncio
     async def test_session_activity_tracking(self):
-        """Test that session activity timestamps are updated."""
-        manager = SessionManager()
+        """Test that a request stamps the session with the manager's clock."""
+        clock = FakeClock()
+        manager = SessionManager(clock=clock)
         session = await manager.get_or_create("activity-test")
+        assert session.last_activity_ts == clock.now()
         
-        initial_activity = session._last_activity_ts
-        
-        # Manually update the activity timestamp to test the mechanism
-        import time
-        await asyncio.sleep(0.01)  # Small delay to ensure timestamp difference
-        session._last_activity_ts = time.time()
+        clock.advance(5)
+        request = asyncio.create_task(session.process_request("hello"))
+        await session.first_client_connected.wait()
+        request.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await request
         
-        assert session._last_activity_ts > initial_activity
+        assert session.last_activity_ts == clock.now()
 
     @pytest.mark.asyncio
     async def test_session_metadata_includes_timestamps(self):